@@ -9,7 +9,8 @@ from blog_app.core.config import settings
 
 from blog_app.db.base import Base
 from blog_app.db.models.user import User, OTP
-from blog_app.db.models.blog import Blog
+from blog_app.db.models.blog import Blog, BlogArchive
+from blog_app.db.models.email import EmailOutbox
 
 
 # this is the Alembic Config object, which provides
@@ -0,0 +1,67 @@
+"""compress blog bodies with lz4
+
+Revision ID: 8e4f2a6c1b93
+Revises: 3c5e1b7d9a02
+Create Date: 2026-10-18 10:21:37.902154
+
+"""
+import logging
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4f2a6c1b93'
+down_revision: Union[str, Sequence[str], None] = '3c5e1b7d9a02'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+logger = logging.getLogger("alembic.runtime.migration")
+
+BODY_COMPRESSIONS = ("auto", "lz4", "pglz")
+
+
+def _lz4_available() -> bool:
+    # Column compression needs PostgreSQL 14+ built with lz4
+    return bool(op.get_bind().scalar(sa.text(
+        "SELECT 'lz4' = ANY(enumvals) FROM pg_settings WHERE name = 'default_toast_compression'"
+    )))
+
+
+def _use_lz4() -> bool:
+    # Chosen with "alembic -x body_compression=auto|lz4|pglz upgrade head";
+    # auto (the default) uses lz4 when the server supports it
+    choice = context.get_x_argument(as_dictionary=True).get("body_compression", "auto")
+    if choice not in BODY_COMPRESSIONS:
+        raise RuntimeError(f"body_compression must be one of {', '.join(BODY_COMPRESSIONS)}, not {choice!r}")
+    if choice == "pglz":
+        logger.info("Blog bodies keep pglz compression (body_compression=pglz)")
+        return False
+    if not _lz4_available():
+        if choice == "lz4":
+            raise RuntimeError("body_compression=lz4, but this PostgreSQL server does not support lz4")
+        logger.info("Blog bodies keep pglz compression: this PostgreSQL server does not support lz4")
+        return False
+    logger.info("Blog bodies will be compressed with lz4 (body_compression=%s)", choice)
+    return True
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Postgres compresses and decompresses the values itself, so queries and
+    # the generated search_vector are unaffected. lz4 decompresses several
+    # times faster than pglz for a similar ratio on prose. Applies to values
+    # as they are written; existing bodies move over when updated.
+    if _use_lz4():
+        op.execute("ALTER TABLE blogs ALTER COLUMN content SET COMPRESSION lz4")
+        op.execute("ALTER TABLE blogs_archive ALTER COLUMN content SET COMPRESSION lz4")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Harmless when upgrade() kept pglz; DEFAULT means default_toast_compression
+    if _lz4_available():
+        op.execute("ALTER TABLE blogs_archive ALTER COLUMN content SET COMPRESSION DEFAULT")
+        op.execute("ALTER TABLE blogs ALTER COLUMN content SET COMPRESSION DEFAULT")
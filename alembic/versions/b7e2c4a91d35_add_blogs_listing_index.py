@@ -0,0 +1,33 @@
+"""add blogs listing index
+
+Revision ID: b7e2c4a91d35
+Revises: 24f589113f1d
+Create Date: 2026-10-18 10:12:41.503218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c4a91d35'
+down_revision: Union[str, Sequence[str], None] = '24f589113f1d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_blogs_is_deleted_created_at_id',
+        'blogs',
+        ['is_deleted', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_blogs_is_deleted_created_at_id', table_name='blogs')
@@ -0,0 +1,95 @@
+"""Seeding and timing helpers shared by the benchmarks."""
+import statistics
+import time
+from typing import Callable, Dict
+from sqlalchemy import func, select, text
+from blog_app.db.base import SessionLocal
+from blog_app.db.models.blog import Blog
+from blog_app.db.models.user import User
+
+# Seeded posts have slugs "bench-<n>" and belong to this user
+BENCH_SLUG_PREFIX = "bench-"
+BENCH_AUTHOR = "bench-author"
+SEED_CHUNK = 100_000
+
+_WORDS = (
+    "the of and to in is that for it as with was on be by this are from at or an but not have "
+    "database index query postgres python fastapi latency throughput cache worker async pool "
+    "connection transaction commit vacuum planner cursor pagination search ranking vector "
+    "compression gzip network bandwidth mobile client server request response json stream "
+    "deploy kubernetes docker container memory cpu profile benchmark regression release "
+    "garden recipe travel mountain river coffee bicycle music guitar novel history science"
+).split()
+
+# Word k of post n is drawn with a skew towards the start of the list, so
+# common words match many rows and rare ones few, as in real prose.
+_SEED_SQL = text("""
+    INSERT INTO blogs (title, slug, excerpt, content, author_id, created_at, updated_at, is_deleted)
+    SELECT
+        'Benchmark post ' || n,
+        :prefix || n,
+        'Excerpt of benchmark post ' || n,
+        (
+            SELECT string_agg(
+                (:words)[1 + floor(cardinality(:words) * power(((n * k * 2654435761) % 1000003) / 1000003.0, 2))::int],
+                ' '
+            )
+            FROM generate_series(1, 60) AS k
+        ),
+        :author_id,
+        now() - n * interval '1 second',
+        now() - n * interval '1 second',
+        false
+    FROM generate_series(:first, :last) AS n
+""")
+
+
+def ensure_blogs(rows: int) -> int:
+    """Seed benchmark posts until at least ``rows`` exist. Returns the live post count."""
+    with SessionLocal() as db:
+        author_id = db.scalar(select(User.id).where(User.username == BENCH_AUTHOR))
+        if author_id is None:
+            author_id = db.scalar(text(
+                "INSERT INTO users (email, username, full_name, hashed_password, verified, is_active) "
+                "VALUES (:email, :username, 'Benchmark Author', '!', true, true) RETURNING id"
+            ), {"email": f"{BENCH_AUTHOR}@example.com", "username": BENCH_AUTHOR})
+        seeded = db.scalar(select(func.count()).select_from(Blog).where(Blog.slug.like(f"{BENCH_SLUG_PREFIX}%")))
+        if seeded < rows:
+            print(f"Seeding {rows - seeded} posts...", flush=True)
+        for first in range(seeded + 1, rows + 1, SEED_CHUNK):
+            last = min(first + SEED_CHUNK - 1, rows)
+            db.execute(_SEED_SQL, {
+                "prefix": BENCH_SLUG_PREFIX,
+                "words": _WORDS,
+                "author_id": author_id,
+                "first": first,
+                "last": last
+            })
+            db.commit()
+            print(f"  {last}/{rows}", flush=True)
+        if seeded < rows:
+            db.execute(text("ANALYZE blogs"))
+            db.commit()
+        return db.scalar(select(func.count()).select_from(Blog).where(Blog.is_deleted == False))
+
+
+def measure(fn: Callable[[], object], repeat: int, warmup: int = 3) -> Dict[str, float]:
+    """Call ``fn`` ``repeat`` times after ``warmup`` calls; latencies in milliseconds."""
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "p50": statistics.median(samples),
+        "p95": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+        "mean": statistics.fmean(samples),
+    }
+
+
+def report(name: str, stats: Dict[str, float]) -> None:
+    """Print one result line."""
+    print(f"{name:<40} p50 {stats['p50']:9.3f} ms   p95 {stats['p95']:9.3f} ms   mean {stats['mean']:9.3f} ms")
@@ -0,0 +1,36 @@
+"""Cost of the listing total_count under each BLOG_COUNT_STRATEGY.
+
+Run with ``python -m benchmarks.count``. ``exact`` runs COUNT(*) over every
+live post, so it grows with the table; ``cached`` pays that cost once per
+BLOG_COUNT_CACHE_TTL_SECONDS; ``estimated`` asks the planner and stays flat.
+"""
+import argparse
+import asyncio
+from blog_app.crud.blog import blog_crud
+from blog_app.db.base import SessionLocal
+from benchmarks.common import ensure_blogs, measure, report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="posts to seed (default: 1,000,000)")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    live = ensure_blogs(args.rows)
+    print(f"{live} live posts\n")
+    loop = asyncio.new_event_loop()
+    with SessionLocal() as db:
+        async def load():
+            return blog_crud.count_blogs(db)
+
+        report("exact", measure(lambda: blog_crud.count_blogs(db), args.repeat))
+        # Includes one miss in the warmup, then hits until the TTL expires
+        report("cached", measure(lambda: loop.run_until_complete(blog_crud.count_cache.get_or_load("live", load)), args.repeat))
+        report("estimated", measure(lambda: blog_crud.count_blogs(db, estimated=True), args.repeat))
+        print(f"\nexact {blog_crud.count_blogs(db)}, estimated {blog_crud.count_blogs(db, estimated=True)}")
+    loop.close()
+
+
+if __name__ == "__main__":
+    main()
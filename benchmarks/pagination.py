@@ -0,0 +1,55 @@
+"""Listing latency by page depth: OFFSET (skip) versus keyset (cursor) pages.
+
+Run with ``python -m benchmarks.pagination``. OFFSET pages get slower the
+deeper they are, because Postgres reads and discards every earlier row;
+cursor pages should stay flat.
+"""
+import argparse
+from sqlalchemy import select
+from blog_app.crud.blog import blog_crud
+from blog_app.db.base import SessionLocal
+from blog_app.db.models.blog import Blog
+from benchmarks.common import ensure_blogs, measure, report
+
+
+def cursor_at(db, offset: int):
+    """The (created_at, id) cursor that starts the page at ``offset``."""
+    row = db.execute(
+        select(Blog.created_at, Blog.id)
+        .where(Blog.is_deleted == False)
+        .order_by(Blog.created_at.desc(), Blog.id.desc())
+        .offset(offset - 1)
+        .limit(1)
+    ).one()
+    return row.created_at, row.id
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="posts to seed (default: 1,000,000)")
+    parser.add_argument("--limit", type=int, default=10, help="page size (default: 10)")
+    parser.add_argument("--pages", type=int, nargs="+", default=[1, 100, 1_000, 10_000], help="page numbers to time")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    live = ensure_blogs(args.rows)
+    print(f"{live} live posts, {args.limit} per page\n")
+    with SessionLocal() as db:
+        for page in args.pages:
+            offset = (page - 1) * args.limit
+            if offset >= live:
+                print(f"page {page}: beyond the last page, skipped")
+                continue
+            report(
+                f"page {page:>6} skip",
+                measure(lambda: blog_crud.get_all_blogs(db, skip=offset, limit=args.limit), args.repeat)
+            )
+            cursor = cursor_at(db, offset) if offset else None
+            report(
+                f"page {page:>6} cursor",
+                measure(lambda: blog_crud.get_all_blogs(db, skip=0, limit=args.limit, cursor=cursor), args.repeat)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Full-text search latency against the GIN index, with an ILIKE scan for scale.
+
+Run with ``python -m benchmarks.search``. Each query is timed for its first
+page and, when there is one, for the page reached by following ``--depth``
+cursors. Results are ranked, so a query's cost grows with how many posts it
+matches; the seed vocabulary is small, so its words match most posts, while
+a title number matches one. The ILIKE row finds that one post without the
+index.
+"""
+import argparse
+from sqlalchemy import func, select
+from blog_app.crud.blog import blog_crud
+from blog_app.db.base import SessionLocal
+from blog_app.db.models.blog import Blog, SEARCH_CONFIG
+from blog_app.utils.blog import decode_rank_cursor
+from benchmarks.common import ensure_blogs, measure, report
+
+# From one match (a title number) to most of the table (seed words, an "or")
+QUERIES = ["12345", '"query planner"', "guitar", "database", "coffee or bicycle"]
+
+
+def match_count(db, query: str) -> int:
+    """Number of posts a search matches, deleted ones included."""
+    ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+    return db.scalar(select(func.count()).where(Blog.search_vector.op("@@")(ts_query)))
+
+
+def cursor_after(db, query: str, limit: int, depth: int):
+    """Return the cursor for page ``depth + 1``, or None if there are fewer pages."""
+    cursor = None
+    for _ in range(depth):
+        _, next_cursor = blog_crud.search_blogs(db, query, limit=limit, cursor=cursor)
+        if next_cursor is None:
+            return None
+        cursor = decode_rank_cursor(next_cursor)
+    return cursor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000, help="posts to seed (default: 1,000,000)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--depth", type=int, default=10, help="pages to follow for the deep row (default: 10)")
+    parser.add_argument("--repeat", type=int, default=30)
+    args = parser.parse_args()
+
+    live = ensure_blogs(args.rows)
+    print(f"{live} live posts, {args.limit} per page\n")
+    with SessionLocal() as db:
+        for query in QUERIES:
+            print(f"{query}: {match_count(db, query)} matches")
+            report("  page 1", measure(lambda: blog_crud.search_blogs(db, query, limit=args.limit), args.repeat))
+            cursor = cursor_after(db, query, args.limit, args.depth)
+            if cursor is not None:
+                report(
+                    f"  page {args.depth + 1}",
+                    measure(lambda: blog_crud.search_blogs(db, query, limit=args.limit, cursor=cursor), args.repeat)
+                )
+
+        scan = select(Blog.id).where(Blog.title.ilike("% 12345")).limit(args.limit)
+        report("ILIKE title 12345", measure(lambda: db.execute(scan).all(), max(3, args.repeat // 10), warmup=1))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""Listing throughput with FAST_JSON off and on.
+
+Run with ``python -m benchmarks.serialization``. For each setting it
+starts a fresh process, since FAST_JSON is read at import, and measures
+``GET /api/blog/?limit=100`` two ways:
+
+- ``http``: the app under uvicorn, driven with ``--concurrency`` requests
+  in flight for ``--duration`` seconds. The load generator shares the
+  machine with the server, so on few cores it limits the result.
+- ``asgi``: the same request sent straight into the ASGI app, one at a
+  time, so only the app's own work (query, models, JSON) is timed.
+"""
+import argparse
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import httpx
+from benchmarks.common import ensure_blogs
+
+PATH = "/api/blog/?limit=100"
+
+
+def start_server(port: int, fast_json: bool) -> subprocess.Popen:
+    # A cached total_count keeps COUNT(*) over the seeded table out of the numbers
+    env = {**os.environ, "FAST_JSON": str(fast_json), "DEBUG": "False", "BLOG_COUNT_STRATEGY": "cached"}
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "blog_app.main:app", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=env
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/health").raise_for_status()
+            return server
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("Server did not start")
+
+
+async def drive(url: str, concurrency: int, duration: float) -> dict:
+    """Send requests from ``concurrency`` tasks until ``duration`` has passed."""
+    latencies = []
+    errors = 0
+
+    async def worker(client: httpx.AsyncClient, deadline: float) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            response = await client.get(url)
+            if response.status_code != 200:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(worker(client, time.perf_counter() + 2) for _ in range(concurrency)))
+        latencies.clear()
+        start = time.perf_counter()
+        await asyncio.gather(*(worker(client, start + duration) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "errors": errors,
+    }
+
+
+async def drive_asgi(duration: float) -> dict:
+    """Call the app in this process, one request at a time, for ``duration`` seconds."""
+    from blog_app.main import app
+
+    path, _, query = PATH.partition("?")
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET", "scheme": "http",
+        "path": path, "raw_path": path.encode(), "query_string": query.encode(), "root_path": "",
+        "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+    errors = 0
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        nonlocal errors
+        if message["type"] == "http.response.start" and message["status"] != 200:
+            errors += 1
+
+    latencies = []
+    for measuring in (False, True):
+        end = time.perf_counter() + (duration if measuring else 2)
+        start = time.perf_counter()
+        while time.perf_counter() < end:
+            request_start = time.perf_counter()
+            await app(dict(scope), receive, send)
+            if measuring:
+                latencies.append(time.perf_counter() - request_start)
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50": latencies[len(latencies) // 2] * 1000,
+        "p95": latencies[int(len(latencies) * 0.95)] * 1000,
+        "errors": errors,
+    }
+
+
+def run_asgi(fast_json: bool, duration: float) -> str:
+    """Run the asgi measurement in a child process built with the given FAST_JSON."""
+    env = {**os.environ, "FAST_JSON": str(fast_json), "DEBUG": "False", "BLOG_COUNT_STRATEGY": "cached"}
+    child = subprocess.run(
+        [sys.executable, "-m", "benchmarks.serialization", "--asgi-child", "--duration", str(duration)],
+        env=env, check=True, capture_output=True, text=True
+    )
+    return child.stdout.splitlines()[-1]
+
+
+def format_result(result: dict) -> str:
+    return (
+        f"{result['rps']:8.1f} req/s   p50 {result['p50']:7.2f} ms   "
+        f"p95 {result['p95']:7.2f} ms   errors {result['errors']}"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1000, help="posts to seed (default: 1,000)")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per measurement (default: 15)")
+    parser.add_argument("--asgi-child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.asgi_child:
+        print(format_result(asyncio.run(drive_asgi(args.duration))))
+        return
+
+    ensure_blogs(args.rows)
+    for fast_json in (False, True):
+        server = start_server(args.port, fast_json)
+        try:
+            result = asyncio.run(drive(f"http://127.0.0.1:{args.port}{PATH}", args.concurrency, args.duration))
+        finally:
+            server.terminate()
+            server.wait()
+        print(f"http  FAST_JSON={fast_json!s:<5}  {format_result(result)}")
+        print(f"asgi  FAST_JSON={fast_json!s:<5}  {run_asgi(fast_json, args.duration)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Slug generation speed, against the regex implementation it replaced.
+
+Run with ``python -m benchmarks.slugs``. Needs no database. Each row is
+the time to build ``--count`` slugs from distinct titles, as a bulk import
+sends them.
+"""
+import argparse
+import random
+import re
+from typing import List
+from blog_app.utils.blog import generate_slug, generate_slugs, to_base62
+from benchmarks.common import _WORDS, measure, report
+
+# Filled with the post number and random seed words, so every title differs
+TEMPLATES = {
+    "short ascii": "{words} {n}",
+    "long ascii": "  A Very Long Title -- With {words}, Numbers ({n}) & Extra   Whitespace That Keeps Going!  ",
+    "unicode": "Straßenfest {n} in Köln: {words} à la française",
+}
+
+
+def distinct_titles(template: str, count: int) -> List[str]:
+    rng = random.Random(0)
+    return [
+        template.format(n=n, words=" ".join(rng.choice(_WORDS).capitalize() for _ in range(3)))
+        for n in range(count)
+    ]
+
+
+def regex_slug(title: str, blog_id: int) -> str:
+    """The previous generate_slug: two uncompiled re.sub passes, ASCII only."""
+    base_title = title.lower()[:30]
+    base_title = re.sub(r"\s+", "-", base_title)
+    base_title = re.sub(r"[^a-z0-9\-]", "", base_title)
+    return f"{base_title}-{to_base62(blog_id)}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=10_000, help="slugs per timed call (default: 10,000)")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    ids = list(range(1_000_000, 1_000_000 + args.count))
+    for name, template in TEMPLATES.items():
+        titles = distinct_titles(template, args.count)
+        report(f"{name} regex", measure(lambda: [regex_slug(t, i) for t, i in zip(titles, ids)], args.repeat))
+        report(f"{name} generate_slug", measure(lambda: [generate_slug(t, i) for t, i in zip(titles, ids)], args.repeat))
+        report(f"{name} generate_slugs", measure(lambda: generate_slugs(titles, ids), args.repeat))
+
+
+if __name__ == "__main__":
+    main()
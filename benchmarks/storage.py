@@ -0,0 +1,98 @@
+"""Where blog bodies end up under each storage setting, and what listings pay.
+
+Run with ``python -m benchmarks.storage``. For each body size it fills a
+scratch table per setting with random words, then reports the heap and TOAST
+sizes, the stored body size and the time of a scan reading only the listing
+columns.
+
+- ``default``: Postgres defaults. Rows over ~2 kB (TOAST_TUPLE_THRESHOLD)
+  are compressed first and only moved out of line if still too big.
+- ``target 512``: ``toast_tuple_target = 512``, as migration 3c5e1b7d9a02
+  sets on ``blogs``. Rows over ~2 kB are toasted until they fit in 512 bytes,
+  so a body that compresses below 2 kB still leaves the heap.
+- ``external``: ``SET STORAGE EXTERNAL``. Out of line past the same ~2 kB
+  threshold, but never compressed.
+
+No setting moves a row under ~2 kB; that threshold is fixed when Postgres is
+built.
+
+The tables are temporary and dropped when the script exits.
+"""
+import argparse
+import time
+from sqlalchemy import text
+from blog_app.db.base import engine
+from benchmarks.common import _WORDS
+
+SETTINGS = {
+    "default": "",
+    "target 512": "ALTER TABLE {table} SET (toast_tuple_target = 512)",
+    "external": "ALTER TABLE {table} ALTER COLUMN content SET STORAGE EXTERNAL",
+}
+
+# Seed vocabulary words in random order, which compresses about as well as
+# prose. The subquery mentions n so that each row gets its own body.
+_FILL_SQL = """
+    INSERT INTO {table} (title, excerpt, content)
+    SELECT
+        'Post ' || n,
+        'Excerpt of post ' || n,
+        left((
+            SELECT string_agg((:words)[1 + floor(random() * cardinality(:words))::int], ' ')
+            FROM generate_series(1, :words_per_body) AS k
+            WHERE n IS NOT NULL
+        ), :size)
+    FROM generate_series(1, :rows) AS n
+"""
+
+
+def measure_table(conn, table: str, setting: str, size: int, rows: int, repeat: int) -> dict:
+    conn.execute(text(
+        f"CREATE TEMP TABLE {table} (id serial PRIMARY KEY, title varchar(255), excerpt varchar(500), content text)"
+    ))
+    if SETTINGS[setting]:
+        conn.execute(text(SETTINGS[setting].format(table=table)))
+    conn.execute(text(_FILL_SQL.format(table=table)), {
+        "words": _WORDS, "words_per_body": size // 5 + 1, "size": size, "rows": rows
+    })
+    conn.execute(text(f"ANALYZE {table}"))
+    heap, toast = conn.execute(text(
+        "SELECT pg_relation_size(c.oid), coalesce(pg_relation_size(c.reltoastrelid), 0) "
+        "FROM pg_class c WHERE c.oid = CAST(:table AS regclass)"
+    ), {"table": table}).one()
+    stored = conn.scalar(text(f"SELECT avg(pg_column_size(content)) FROM {table}"))
+    scan = text(f"SELECT count(title), count(excerpt) FROM {table}")
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        conn.execute(scan)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {"heap": heap, "toast": toast, "stored": stored, "scan": samples[len(samples) // 2]}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 16000], help="body sizes in bytes")
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows per table; body = average stored (compressed) body size\n")
+    with engine.connect() as conn:
+        for size in args.sizes:
+            for index, setting in enumerate(SETTINGS):
+                table = f"bench_storage_{size}_{index}"
+                result = measure_table(conn, table, setting, size, args.rows, args.repeat)
+                print(
+                    f"{size:>6} B  {setting:<11} heap {result['heap'] / 2**20:8.1f} MB   "
+                    f"toast {result['toast'] / 2**20:8.1f} MB   body {result['stored']:6.0f} B   "
+                    f"listing scan {result['scan']:7.1f} ms"
+                )
+                conn.execute(text(f"DROP TABLE {table}"))
+            print()
+        conn.rollback()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,76 +1,255 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from typing import List
-from sqlalchemy.orm import Session
-from blog_app.db.session import get_db
-from blog_app.crud.blog import blog_crud
-from blog_app.schemas.blog import BlogCreate, BlogResponse, BlogUpdate, GetAllBlogsResponse
+import logging
+import time
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from typing import List, Optional
+from blog_app.db.session import get_db, AnySession
+from blog_app.core.config import settings
+from blog_app.core.serialization import encode_model, trusted_response
+from blog_app.crud.blog import blog_crud, BlogNotFound, NotBlogAuthor
+from blog_app.crud.async_crud import async_blog_crud, stream_partitions
+from blog_app.schemas.blog import (
+    BlogCreate,
+    BlogExport,
+    BlogResponse,
+    BlogUpdate,
+    BulkImportResponse,
+    GetAllBlogsResponse,
+    SearchBlogsResponse
+)
 from blog_app.schemas.user import UserResponse
-from blog_app.dependencies import get_current_verified_user
+from blog_app.dependencies import get_current_verified_user, limit_per_user
+from blog_app.utils.blog import decode_cursor, decode_rank_cursor
+from blog_app.utils.http import make_cached_response, cache_headers, is_not_modified, iter_lines, accepts_gzip
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Longest NDJSON line accepted by POST /bulk
+BULK_MAX_LINE_BYTES = 10 * 1024 * 1024
+
 
-@router.post("/", response_model=dict, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_per_user("blog_write:user"))]
+)
 async def create_blog(
     blog_data: BlogCreate, 
-    db: Session = Depends(get_db), 
+    db: AnySession = Depends(get_db), 
     current_verified_user: UserResponse = Depends(get_current_verified_user)
 ):
     """Create a new blog post."""
-    blog = blog_crud.create_blog(db, current_verified_user.id, blog_data)
-    return {"message": "Blog created successfully", "blog_id": blog.id}
+    blog = await async_blog_crud.create_blog(db, current_verified_user.id, blog_data)
+    return {"message": "Blog created successfully", "blog_id": blog["id"]}
 
 
 @router.get("/", response_model=GetAllBlogsResponse)
 async def get_blogs(
-    db: Session = Depends(get_db),
+    db: AnySession = Depends(get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
-    limit: int = Query(10, ge=1, le=100, description="Max number of records to return")
+    limit: int = Query(10, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor; overrides skip")
 ):
     """Get all blog posts."""
-    blogs, total_count = blog_crud.get_all_blogs(db, skip=skip, limit=limit)
+    position = None
+    if cursor is not None:
+        try:
+            position = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    blogs, next_cursor = await async_blog_crud.get_all_blogs(db, skip=skip, limit=limit, cursor=position)
     if not blogs:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="No blogs found")
-    return GetAllBlogsResponse(blogs=blogs, total_count=total_count)
+    total_count = await _count_blogs(db)
+    return trusted_response(GetAllBlogsResponse, blogs=blogs, total_count=total_count, next_cursor=next_cursor)
+
+
+async def _count_blogs(db: AnySession) -> int:
+    """Count live blogs using the configured BLOG_COUNT_STRATEGY."""
+    if settings.BLOG_COUNT_STRATEGY == "estimated":
+        return await async_blog_crud.count_blogs(db, estimated=True)
+    if settings.BLOG_COUNT_STRATEGY == "cached":
+        return await blog_crud.count_cache.get_or_load("live", lambda: async_blog_crud.count_blogs(db))
+    return await async_blog_crud.count_blogs(db)
+
+
+@router.get("/search", response_model=SearchBlogsResponse)
+async def search_blogs(
+    db: AnySession = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms; supports quoted phrases, 'or' and '-word'"),
+    limit: int = Query(10, ge=1, le=100, description="Max number of records to return"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor")
+):
+    """Search blog posts by title, excerpt and content."""
+    position = None
+    if cursor is not None:
+        try:
+            position = decode_rank_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+    blogs, next_cursor = await async_blog_crud.search_blogs(db, q, limit=limit, cursor=position)
+    return trusted_response(SearchBlogsResponse, blogs=blogs, next_cursor=next_cursor)
+
+
+@router.post("/bulk", response_model=BulkImportResponse, dependencies=[Depends(limit_per_user("blog_write:user"))])
+async def bulk_import_blogs(
+    request: Request,
+    db: AnySession = Depends(get_db),
+    current_verified_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Import blog posts from an NDJSON body, one BlogCreate object per line.
+
+    Rows are committed every BLOG_BULK_BATCH_SIZE lines; on a bad line the
+    error reports how many rows were already imported.
+    """
+    start = time.perf_counter()
+    imported = 0
+    batch: List[BlogCreate] = []
+    batch_first_line = line_number = 0
+    try:
+        async for line in iter_lines(request.stream(), BULK_MAX_LINE_BYTES):
+            line_number += 1
+            if not line.strip():
+                continue
+            if not batch:
+                batch_first_line = line_number
+            batch.append(BlogCreate.model_validate_json(line))
+            if len(batch) >= settings.BLOG_BULK_BATCH_SIZE:
+                imported += await _import_batch(db, current_verified_user.id, batch, batch_first_line, line_number, imported)
+                batch = []
+    except (ValidationError, ValueError) as exc:
+        message = exc.errors()[0]["msg"] if isinstance(exc, ValidationError) else str(exc)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Line {line_number}: {message}; {imported} blogs imported before it"
+        )
+    imported += await _import_batch(db, current_verified_user.id, batch, batch_first_line, line_number, imported)
 
+    seconds = time.perf_counter() - start
+    return BulkImportResponse(imported=imported, seconds=seconds, rows_per_second=imported / seconds if seconds else 0.0)
 
-@router.get("/{slug}", response_model=BlogResponse)
-async def get_blog(slug: str, db: Session = Depends(get_db)):
+
+def _rejected_value(exc: Exception) -> Optional[str]:
+    """The database's reason for refusing a value, or None for other failures."""
+    if isinstance(exc, ValueError):
+        # psycopg2 refuses NUL characters before sending the statement
+        return str(exc)
+    orig = getattr(exc, "orig", None)
+    # SQLSTATE classes 22 (data exception) and 23 (integrity constraint violation)
+    if (getattr(orig, "pgcode", None) or "")[:2] not in ("22", "23"):
+        return None
+    # asyncpg's own exception carries the plain server message
+    return str(orig.__cause__ or orig).splitlines()[0]
+
+
+async def _import_batch(
+    db: AnySession,
+    author_id: int,
+    batch: List[BlogCreate],
+    first_line: int,
+    last_line: int,
+    imported: int
+) -> int:
+    """Insert one bulk import batch, reporting a failure with the rows imported before it."""
+    try:
+        return await async_blog_crud.bulk_create_blogs(db, author_id, batch)
+    except (SQLAlchemyError, ValueError) as exc:
+        lines = f"Lines {first_line}-{last_line}"
+        message = _rejected_value(exc)
+        if message is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"{lines}: {message}; {imported} blogs imported before them"
+            )
+        logger.exception("Bulk import batch failed")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"{lines} could not be stored; {imported} blogs imported before them"
+        )
+
+
+@router.get("/export")
+async def export_blogs(
+    db: AnySession = Depends(get_db),
+    current_verified_user: UserResponse = Depends(get_current_verified_user)
+):
+    """Stream every live blog post as NDJSON, one BlogExport object per line."""
+    async def body():
+        start = time.perf_counter()
+        exported = 0
+        async for rows in stream_partitions(db, blog_crud.export_statement(), settings.BLOG_BULK_BATCH_SIZE):
+            exported += len(rows)
+            yield b"".join(encode_model(BlogExport, row._asdict()) + b"\n" for row in rows)
+        seconds = time.perf_counter() - start
+        logger.info("Exported %d blogs in %.2fs (%.0f rows/s)", exported, seconds, exported / seconds if seconds else 0.0)
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+
+@router.get("/{slug}", response_model=BlogResponse, responses={304: {"description": "Not Modified"}})
+async def get_blog(slug: str, request: Request, db: AnySession = Depends(get_db)):
     """Get a blog post by slug."""
-    blog = blog_crud.get_blog_by_slug(db, slug)
-    if not blog:
+    async def load():
+        blog = await async_blog_crud.get_blog_by_slug(db, slug)
+        if not blog:
+            return None
+        return make_cached_response(
+            encode_model(BlogResponse, blog),
+            blog["updated_at"] or blog["created_at"],
+            gzip_min_size=settings.RESPONSE_COMPRESSION_MIN_BYTES if settings.RESPONSE_COMPRESSION_ENABLED else None,
+            gzip_level=settings.RESPONSE_COMPRESSION_LEVEL
+        )
+
+    if settings.BLOG_RESPONSE_CACHE_ENABLED:
+        cached = await blog_crud.response_cache.get_or_load(slug, load)
+    else:
+        cached = await load()
+    if cached is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
-    return blog
+
+    # Hot posts are gzipped once, when cached; GZipMiddleware leaves encoded responses alone
+    gzipped = cached.gzip_body is not None and accepts_gzip(request.headers.get("accept-encoding"))
+    headers = cache_headers(cached, settings.BLOG_HTTP_MAX_AGE_SECONDS, gzipped=gzipped)
+    if is_not_modified(cached, request.headers.get("if-none-match"), request.headers.get("if-modified-since")):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = cached.gzip_body if gzipped else cached.body
+    return Response(content=body, media_type="application/json", headers=headers)
 
 
-@router.delete("/{slug}", response_model=dict)
+@router.delete("/{slug}", response_model=dict, dependencies=[Depends(limit_per_user("blog_write:user"))])
 async def delete_blog(
     slug: str, 
-    db: Session = Depends(get_db), 
+    db: AnySession = Depends(get_db), 
     current_verified_user: UserResponse = Depends(get_current_verified_user)
 ):
     """Delete a blog post by slug."""
-    blog = blog_crud.get_blog_by_slug(db, slug)
-    if not blog:
+    try:
+        await async_blog_crud.delete_blog(db, slug, current_verified_user.id)
+    except BlogNotFound:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
-    if blog.get('author_id') != current_verified_user.id:
+    except NotBlogAuthor:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to delete this blog")
-    blog_crud.delete_blog(db, blog.get('id'))
     return {"message": "Blog deleted successfully"}
 
 
-@router.put("/{slug}", response_model=dict)
+@router.put("/{slug}", response_model=dict, dependencies=[Depends(limit_per_user("blog_write:user"))])
 async def update_blog(
     slug: str, 
     blog_data: BlogUpdate, 
-    db: Session = Depends(get_db), 
+    db: AnySession = Depends(get_db), 
     current_verified_user: UserResponse = Depends(get_current_verified_user)
 ):
     """Update a blog post by slug."""
-    blog = blog_crud.get_blog_by_slug(db, slug)
-    if not blog:
+    try:
+        await async_blog_crud.update_blog(db, slug, current_verified_user.id, blog_data)
+    except BlogNotFound:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Blog not found")
-    if blog.get('author_id') != current_verified_user.id:
+    except NotBlogAuthor:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Not authorized to update this blog")
-    blog_crud.update_blog(db, blog.get('id'), blog_data)
     return {"message": "Blog updated successfully"}
@@ -1,7 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Response, BackgroundTasks
-from sqlalchemy.orm import Session
-from blog_app.db.session import get_db
-from blog_app.crud.user import user_crud
+from fastapi import APIRouter, Depends, HTTPException, status, Response
+from blog_app.db.session import get_db, AnySession
+from blog_app.crud.async_crud import async_user_crud
+from blog_app.crud.user import UserAlreadyExists
 from blog_app.schemas import (
     UserCreate, 
     UserResponse, 
@@ -16,36 +16,36 @@ from blog_app.core.security import (
     generate_token_payload
 )
 from blog_app.core.config import settings
+from blog_app.core.hashing import password_hasher, PasswordHasherBusy
+from blog_app.dependencies import enforce_rate_limit, get_current_active_user, limit_per_ip, refund_rate_limit
 from blog_app.utils.email import send_verification_email
 
 router = APIRouter()
 
 
-@router.post("/signup", response_model=dict, status_code=status.HTTP_201_CREATED)
-async def signup(user_data: UserCreate, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
+@router.post(
+    "/signup",
+    response_model=dict,
+    status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(limit_per_ip("signup:ip"))]
+)
+async def signup(user_data: UserCreate, db: AnySession = Depends(get_db)):
     """User registration endpoint."""
-    # Check if user already exists
-    if user_crud.get_user_by_email(db, user_data.email):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Email already registered"
-        )
-    
-    if user_crud.get_user_by_username(db, user_data.username):
+    # Create user, OTP and (in outbox mode) the email in one transaction;
+    # the unique indexes catch duplicates instead of pre-check queries
+    hashed_password = await password_hasher.hash(user_data.password)
+    otp_code = generate_otp()
+    try:
+        user = await async_user_crud.register_user(db, user_data, hashed_password, otp_code)
+    except UserAlreadyExists as exc:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Username already taken"
+            detail="Email already registered" if exc.field == "email" else "Username already taken"
         )
     
-    # Create user
-    user = user_crud.create_user(db, user_data)
-    
-    # Generate OTP
-    otp_code = generate_otp()
-    user_crud.create_otp(db, user.email, otp_code)
-    
-    # Send verification email
-    background_tasks.add_task(send_verification_email, user.email, otp_code)
+    # Send verification email; in outbox mode it was queued with the user
+    if settings.EMAIL_DELIVERY == "queue":
+        send_verification_email(user.email, otp_code)
     
     return {
         "message": "User registered successfully. Please check your email for verification code.",
@@ -53,31 +53,32 @@ async def signup(user_data: UserCreate, background_tasks: BackgroundTasks, db: S
     }
 
 
-@router.post("/verify", response_model=TokenResponse)
+@router.post("/verify", response_model=TokenResponse, dependencies=[Depends(limit_per_ip("verify:ip"))])
 async def verify_otp(
     otp_data: OTPVerify, 
     response: Response, 
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_db)
 ):
     """Verify OTP and mark user as verified."""
-    # Verify OTP
-    otp = user_crud.verify_otp(db, otp_data.email, otp_data.otp_code)
+    # Bound OTP guessing per account, whatever address the guesses come from.
+    # Charged up front so concurrent guesses count, refunded for a correct code.
+    await enforce_rate_limit("verify:email", otp_data.email.lower())
+
+    # Consume the OTP and mark the user verified in one statement
+    otp_valid, verified_user = await async_user_crud.verify_email(db, otp_data.email, otp_data.otp_code)
     
-    if not otp:
+    if not otp_valid:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Invalid or expired OTP"
         )
+    await refund_rate_limit("verify:email", otp_data.email.lower())
     
-    # Get user and mark as verified
-    user = user_crud.get_user_by_email(db, otp_data.email)
-    if not user:
+    if not verified_user:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found"
         )
-    
-    verified_user = user_crud.verify_user(db, user.id)
 
     # Create tokens
     access_token = create_access_token(data=generate_token_payload(verified_user).model_dump())
@@ -112,21 +113,34 @@ async def verify_otp(
     )
 
 
-@router.post("/login", response_model=TokenResponse)
+@router.post("/login", response_model=TokenResponse, dependencies=[Depends(limit_per_ip("login:ip"))])
 async def login(
     user_credentials: UserLogin,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_db)
 ):
     """User login endpoint."""
+    # Bound password guessing per account before spending a bcrypt verify on it.
+    # Charged up front so concurrent guesses count, refunded for a correct password.
+    await enforce_rate_limit("login:email", user_credentials.email.lower())
+
     # Authenticate user
-    user = user_crud.authenticate_user(db, user_credentials.email, user_credentials.password)
+    user = await async_user_crud.get_user_by_email(db, user_credentials.email)
     
-    if not user:
+    if not user or not await password_hasher.verify(user_credentials.password, user.hashed_password):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
+    await refund_rate_limit("login:email", user_credentials.email.lower())
+    
+    # Upgrade hashes made with an outdated bcrypt cost; skipped when the pool is busy
+    if password_hasher.needs_update(user.hashed_password):
+        try:
+            new_hash = await password_hasher.hash(user_credentials.password)
+            await async_user_crud.update_password_hash(db, user.id, new_hash)
+        except PasswordHasherBusy:
+            pass
     
     if not user.verified:
         raise HTTPException(
@@ -173,6 +187,20 @@ async def login(
     )
 
 
+@router.post("/deactivate")
+async def deactivate_account(
+    response: Response,
+    db: AnySession = Depends(get_db),
+    current_user = Depends(get_current_active_user)
+):
+    """Deactivate the current user's account and revoke its issued tokens."""
+    await async_user_crud.deactivate_user(db, current_user.id)
+    response.delete_cookie(settings.ACCESS_TOKEN_COOKIE_NAME)
+    response.delete_cookie(settings.REFRESH_TOKEN_COOKIE_NAME)
+
+    return {"message": "Account deactivated"}
+
+
 @router.post("/logout")
 async def logout(response: Response):
     """User logout endpoint."""
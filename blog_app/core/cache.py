@@ -0,0 +1,369 @@
+import asyncio
+import json
+import logging
+import pickle
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from collections import OrderedDict, defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from sqlalchemy.util.concurrency import await_only, in_greenlet
+from starlette.concurrency import run_in_threadpool
+from blog_app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CacheBackend(ABC):
+    """Key/value store behind a Cache. Keys are strings, misses return None."""
+
+    # True when every worker reads the same store, so invalidation
+    # messages from other workers need no local delete
+    shared = False
+    # True when calls do network I/O and must run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """Return the found entries for ``keys``."""
+
+    @abstractmethod
+    def set_many(self, mapping: Dict[str, Any], ttl_seconds: float) -> None:
+        """Store every entry in ``mapping``."""
+
+    @abstractmethod
+    def delete_many(self, keys: List[str]) -> None:
+        """Remove ``keys`` if present."""
+
+    def stats(self) -> dict:
+        """Return backend counters."""
+        return {}
+
+
+class InMemoryBackend(CacheBackend):
+    """Thread-safe, size-bounded LRU store whose entries expire after a TTL."""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._data: "OrderedDict[str, tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for key in keys:
+                entry = self._data.get(key)
+                if entry is None or entry[0] <= now:
+                    if entry is not None:
+                        del self._data[key]
+                    self.misses += 1
+                    continue
+                self._data.move_to_end(key)
+                self.hits += 1
+                found[key] = entry[1]
+        return found
+
+    def set_many(self, mapping: Dict[str, Any], ttl_seconds: float) -> None:
+        expires_at = time.monotonic() + ttl_seconds
+        with self._lock:
+            for key, value in mapping.items():
+                self._data[key] = (expires_at, value)
+                self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def delete_many(self, keys: List[str]) -> None:
+        with self._lock:
+            for key in keys:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+
+class RedisBackend(CacheBackend):
+    """Store shared by all workers, on any server speaking the Redis protocol."""
+
+    shared = True
+    blocking = True
+
+    def __init__(self, client):
+        self.client = client
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        found = {}
+        for key, raw in zip(keys, self.client.mget(keys)):
+            if raw is None:
+                self.misses += 1
+                continue
+            self.hits += 1
+            found[key] = pickle.loads(raw)
+        return found
+
+    def set_many(self, mapping: Dict[str, Any], ttl_seconds: float) -> None:
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in mapping.items():
+            pipe.set(key, pickle.dumps(value), px=int(ttl_seconds * 1000))
+        pipe.execute()
+
+    def delete_many(self, keys: List[str]) -> None:
+        if keys:
+            self.client.delete(*keys)
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class InvalidationBus(ABC):
+    """Fans cache invalidations out to every Cache in every worker."""
+
+    blocking = False
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Callable[[str, List[str]], None]]] = defaultdict(list)
+
+    def subscribe(self, namespace: str, callback: Callable[[str, List[str]], None]) -> None:
+        """Call ``callback(origin, keys)`` for every invalidation in ``namespace``."""
+        self._subscribers[namespace].append(callback)
+
+    def _dispatch(self, origin: str, namespace: str, keys: List[str]) -> None:
+        for callback in self._subscribers.get(namespace, ()):
+            try:
+                callback(origin, keys)
+            except Exception:
+                logger.exception("Cache invalidation callback failed for %s", namespace)
+
+    @abstractmethod
+    def publish(self, origin: str, namespace: str, keys: List[str]) -> None:
+        """Announce that ``keys`` in ``namespace`` changed."""
+
+    def start(self) -> None:
+        """Begin receiving messages from other workers."""
+
+    def close(self) -> None:
+        """Stop receiving messages."""
+
+
+class LocalInvalidationBus(InvalidationBus):
+    """In-process bus. Caches sharing one instance behave like separate workers."""
+
+    def publish(self, origin: str, namespace: str, keys: List[str]) -> None:
+        self._dispatch(origin, namespace, keys)
+
+
+class RedisInvalidationBus(InvalidationBus):
+    """Bus over Redis pub/sub, listened to from a daemon thread."""
+
+    blocking = True
+
+    def __init__(self, client, channel: str):
+        super().__init__()
+        self.client = client
+        self.channel = channel
+        self._pubsub = None
+        self._thread: Optional[threading.Thread] = None
+
+    def publish(self, origin: str, namespace: str, keys: List[str]) -> None:
+        message = json.dumps({"origin": origin, "namespace": namespace, "keys": keys})
+        try:
+            self.client.publish(self.channel, message)
+        except Exception:
+            # Peers fall back to their TTL; the local copy is already gone
+            logger.exception("Failed to publish cache invalidation for %s", namespace)
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+        self._pubsub.subscribe(**{self.channel: self._on_message})
+        self._thread = self._pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._thread.stop()
+            self._pubsub.close()
+            self._thread = None
+
+    def _on_message(self, message: dict) -> None:
+        payload = json.loads(message["data"])
+        self._dispatch(payload["origin"], payload["namespace"], payload["keys"])
+
+
+def run_blocking(owner: Any, func: Callable, *args: Any) -> Any:
+    """Call a backend or bus method from sync code without stalling the event loop.
+
+    Sync CRUD code runs either in the threadpool, where blocking is fine, or
+    inside ``AsyncSession.run_sync`` on the event loop thread; there blocking
+    calls are awaited in the threadpool instead.
+    """
+    if owner.blocking and in_greenlet():
+        return await_only(run_in_threadpool(func, *args))
+    return func(*args)
+
+
+class Cache:
+    """Namespaced view of a backend with invalidation and single-flight loads.
+
+    ``invalidate`` removes keys locally and tells every other worker to do
+    the same. ``generation`` advances on each invalidation, local or remote;
+    passing the value read before a load to ``set`` drops a result that
+    raced with an invalidation instead of caching stale data.
+    """
+
+    def __init__(self, namespace: str, backend: CacheBackend, bus: InvalidationBus, ttl_seconds: float):
+        self.namespace = namespace
+        self.backend = backend
+        self.bus = bus
+        self.ttl_seconds = ttl_seconds
+        self.generation = 0
+        self._origin = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        bus.subscribe(namespace, self._on_invalidate)
+
+    def _key(self, key: Any) -> str:
+        return f"{self.namespace}:{key}"
+
+    def get(self, key: Any) -> Optional[Any]:
+        """Return the cached value, or None on a miss."""
+        return run_blocking(self.backend, self.backend.get_many, [self._key(key)]).get(self._key(key))
+
+    def get_many(self, keys: Iterable[Any]) -> Dict[Any, Any]:
+        """Return the cached values found for ``keys``."""
+        keys = list(keys)
+        found = run_blocking(self.backend, self.backend.get_many, [self._key(key) for key in keys])
+        return {key: found[self._key(key)] for key in keys if self._key(key) in found}
+
+    def set(self, key: Any, value: Any, generation: Optional[int] = None) -> None:
+        """Store a value, unless ``generation`` is stale."""
+        self.set_many({key: value}, generation)
+
+    def set_many(self, mapping: Dict[Any, Any], generation: Optional[int] = None) -> None:
+        """Store several values, unless ``generation`` is stale."""
+        if generation is not None and generation != self.generation:
+            return
+        run_blocking(
+            self.backend, self.backend.set_many,
+            {self._key(key): value for key, value in mapping.items()}, self.ttl_seconds
+        )
+
+    def invalidate(self, *keys: Any) -> None:
+        """Remove keys here and in every other worker."""
+        self._bump_generation()
+        names = [self._key(key) for key in keys]
+        run_blocking(self.backend, self.backend.delete_many, names)
+        run_blocking(self.bus, self.bus.publish, self._origin, self.namespace, names)
+
+    def _on_invalidate(self, origin: str, names: List[str]) -> None:
+        if origin == self._origin:
+            return
+        self._bump_generation()
+        if not self.backend.shared:
+            self.backend.delete_many(names)
+
+    def _bump_generation(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    async def get_or_load(self, key: Any, loader: Callable[[], Awaitable[Any]]) -> Any:
+        """Return the cached value, loading it on a miss.
+
+        Concurrent misses for the same key in this worker share one call to
+        ``loader``. None results are returned but not cached.
+        """
+        value = await self._run(self.get, key)
+        if value is not None:
+            return value
+
+        future = self._inflight.get(key)
+        if future is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # Only swallow the leader's cancellation, never our own
+                if not future.cancelled():
+                    raise
+                return await loader()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        generation = self.generation
+        try:
+            value = await loader()
+        except Exception as exc:
+            future.set_exception(exc)
+            # Mark the exception retrieved in case no request was waiting
+            future.exception()
+            raise
+        except BaseException:
+            future.cancel()
+            raise
+        finally:
+            del self._inflight[key]
+        if value is not None:
+            await self._run(self.set, key, value, generation)
+        future.set_result(value)
+        return value
+
+    async def _run(self, func: Callable, *args: Any) -> Any:
+        if self.backend.blocking:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    def stats(self) -> dict:
+        """Return backend counters for this cache."""
+        return {"namespace": self.namespace, "generation": self.generation, **self.backend.stats()}
+
+
+_redis_client = None
+
+
+def get_redis_client():
+    """Return the process-wide Redis client, creating it on first use."""
+    global _redis_client
+    if _redis_client is None:
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("The redis package is required for Redis cache settings") from exc
+        _redis_client = redis.Redis.from_url(settings.CACHE_REDIS_URL)
+    return _redis_client
+
+
+def _create_bus() -> InvalidationBus:
+    if settings.CACHE_INVALIDATION_BUS == "redis":
+        return RedisInvalidationBus(get_redis_client(), settings.CACHE_INVALIDATION_CHANNEL)
+    return LocalInvalidationBus()
+
+
+invalidation_bus = _create_bus()
+
+
+# Every cache made by create_cache, for metrics
+caches: List[Cache] = []
+
+
+def create_cache(namespace: str, max_size: int, ttl_seconds: float) -> Cache:
+    """Create a cache on the configured backend and invalidation bus."""
+    if settings.CACHE_BACKEND == "redis":
+        backend = RedisBackend(get_redis_client())
+    else:
+        backend = InMemoryBackend(max_size)
+    cache = Cache(namespace, backend, invalidation_bus, ttl_seconds)
+    caches.append(cache)
+    return cache
@@ -0,0 +1,118 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+from passlib.context import CryptContext
+from blog_app.core.config import settings
+from blog_app.core.metrics import password_hash_duration, password_hash_rejected
+
+# Password hashing. Pinning min/max rounds to BCRYPT_ROUNDS makes
+# needs_update() flag hashes made with any other cost, so they get
+# rehashed on the next successful login.
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+    bcrypt__max_rounds=settings.BCRYPT_ROUNDS
+)
+
+
+def _hash(password: str) -> str:
+    return pwd_context.hash(password)
+
+
+def _verify(password: str, hashed_password: str) -> bool:
+    return pwd_context.verify(password, hashed_password)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing pool already has too much work queued."""
+
+
+class PasswordHasher:
+    """Runs bcrypt in a bounded process pool so it never holds the event loop.
+
+    At most ``max_workers`` hashes run at once and ``max_queue`` more may
+    wait; anything beyond that is rejected immediately with
+    ``PasswordHasherBusy`` instead of piling up behind the pool.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.failed = 0
+        self.total_seconds = 0.0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # Created on first use so each server worker owns its pool. Spawned
+        # children only import this module, not the app or its DB engines.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def _run(self, operation: str, fn, *args):
+        if self.in_flight >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            password_hash_rejected.inc()
+            raise PasswordHasherBusy()
+
+        self.in_flight += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            result = await loop.run_in_executor(self._get_executor(), fn, *args)
+        except Exception:
+            self.failed += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            self.in_flight -= 1
+            self.total_seconds += elapsed
+            password_hash_duration.observe(elapsed, operation)
+        self.completed += 1
+        return result
+
+    async def hash(self, password: str) -> str:
+        """Generate password hash."""
+        return await self._run("hash", _hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verify a password against its hash."""
+        return await self._run("verify", _verify, password, hashed_password)
+
+    def needs_update(self, hashed_password: str) -> bool:
+        """Check whether a hash was made with outdated settings."""
+        return pwd_context.needs_update(hashed_password)
+
+    def stats(self) -> dict:
+        """Return pool counters."""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "failed": self.failed,
+            "total_seconds": self.total_seconds,
+        }
+
+    def shutdown(self) -> None:
+        """Stop the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
@@ -0,0 +1,236 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from abc import ABC, abstractmethod
+from email.message import Message
+from typing import Callable, List, Optional
+from blog_app.core.config import settings
+from blog_app.core.metrics import email_delivery_latency, email_dropped, email_retries, email_send_duration
+
+logger = logging.getLogger(__name__)
+
+
+class EmailTransport(ABC):
+    """Delivers messages. Each dispatcher thread owns one instance."""
+
+    @abstractmethod
+    def send(self, message: Message) -> None:
+        """Deliver one message, raising on failure."""
+
+    def close(self) -> None:
+        """Release any open connection."""
+
+
+class SMTPTransport(EmailTransport):
+    """Keeps one authenticated SMTP connection open across messages.
+
+    The connection is opened on first send, reused for later messages and
+    replaced after ``max_messages`` or any error.
+    """
+
+    def __init__(self, host: str, port: int, username: str, password: str, timeout: float, max_messages: int):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.max_messages = max_messages
+        self._smtp: Optional[smtplib.SMTP] = None
+        self._sent = 0
+
+    def _connect(self) -> smtplib.SMTP:
+        smtp = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        smtp.starttls()
+        smtp.login(self.username, self.password)
+        return smtp
+
+    def send(self, message: Message) -> None:
+        if self._smtp is None or self._sent >= self.max_messages:
+            self.close()
+            self._smtp = self._connect()
+        try:
+            self._smtp.send_message(message)
+        except Exception:
+            # The connection state is unknown; start afresh next time
+            self.close()
+            raise
+        self._sent += 1
+
+    def close(self) -> None:
+        if self._smtp is not None:
+            try:
+                self._smtp.quit()
+            except Exception:
+                pass
+            self._smtp = None
+            self._sent = 0
+
+
+class ConsoleTransport(EmailTransport):
+    """Logs messages instead of sending them, for local development."""
+
+    def send(self, message: Message) -> None:
+        logger.info("Email to %s: %s\n%s", message["To"], message["Subject"], message.as_string())
+
+
+class InMemoryTransport(EmailTransport):
+    """Collects messages in ``outbox``, shared by all instances, for tests."""
+
+    outbox: List[Message] = []
+
+    def send(self, message: Message) -> None:
+        self.outbox.append(message)
+
+
+def is_permanent_failure(exc: Exception) -> bool:
+    """SMTP 5xx replies and refused recipients will fail again on retry."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        return True
+    return isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code >= 500
+
+
+class EmailDispatcher:
+    """Sends email from a bounded queue on a few background threads.
+
+    Each thread owns one transport, so with SMTP there are at most
+    ``workers`` connections, each reused for every message it sends until
+    the queue has been idle for ``idle_seconds``. Failed sends are retried
+    with exponential backoff. When ``max_queue`` messages are waiting, new
+    ones are dropped instead of blocking the request that queued them.
+    """
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        transport_factory: Callable[[], EmailTransport],
+        workers: int,
+        max_queue: int,
+        max_retries: int,
+        retry_backoff_seconds: float,
+        idle_seconds: float
+    ):
+        self.transport_factory = transport_factory
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_backoff_seconds = retry_backoff_seconds
+        self.idle_seconds = idle_seconds
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self.sent = 0
+        self.failed = 0
+        self.dropped = 0
+        self.retried = 0
+
+    def start(self) -> None:
+        """Start the sender threads if they are not running."""
+        with self._lock:
+            if self._threads:
+                return
+            for index in range(self.workers):
+                thread = threading.Thread(target=self._run, name=f"email-sender-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def submit(self, message: Message) -> bool:
+        """Queue a message for delivery. Returns False if it was dropped."""
+        self.start()
+        try:
+            self._queue.put_nowait((time.perf_counter(), message))
+        except queue.Full:
+            self.dropped += 1
+            email_dropped.inc()
+            logger.error("Email queue full, dropping message to %s", message["To"])
+            return False
+        return True
+
+    def _run(self) -> None:
+        transport = self.transport_factory()
+        try:
+            while True:
+                try:
+                    item = self._queue.get(timeout=self.idle_seconds)
+                except queue.Empty:
+                    # Idle: let the server-side connection go
+                    transport.close()
+                    continue
+                if item is self._STOP:
+                    return
+                self._deliver(transport, *item)
+        finally:
+            transport.close()
+
+    def _deliver(self, transport: EmailTransport, queued_at: float, message: Message) -> None:
+        for attempt in range(self.max_retries + 1):
+            start = time.perf_counter()
+            try:
+                transport.send(message)
+            except Exception as exc:
+                email_send_duration.observe(time.perf_counter() - start, "failed")
+                if is_permanent_failure(exc) or attempt == self.max_retries:
+                    self.failed += 1
+                    email_delivery_latency.observe(time.perf_counter() - queued_at, "failed")
+                    logger.error("Giving up on email to %s after %d attempts: %s", message["To"], attempt + 1, exc)
+                    return
+                self.retried += 1
+                email_retries.inc()
+                time.sleep(self.retry_backoff_seconds * 2 ** attempt)
+                continue
+            email_send_duration.observe(time.perf_counter() - start, "sent")
+            email_delivery_latency.observe(time.perf_counter() - queued_at, "sent")
+            self.sent += 1
+            return
+
+    def stats(self) -> dict:
+        """Return queue counters."""
+        return {
+            "workers": self.workers,
+            "queued": self._queue.qsize(),
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "retried": self.retried,
+        }
+
+    def shutdown(self, timeout: float) -> None:
+        """Send what is already queued, waiting up to ``timeout`` seconds."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        deadline = time.monotonic() + timeout
+        try:
+            for _ in threads:
+                self._queue.put(self._STOP, timeout=max(0.0, deadline - time.monotonic()))
+        except queue.Full:
+            # Still backed up at the deadline; the daemon threads die with the process
+            return
+        for thread in threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+
+
+def create_transport() -> EmailTransport:
+    """Create the transport selected by EMAIL_TRANSPORT."""
+    if settings.EMAIL_TRANSPORT == "console":
+        return ConsoleTransport()
+    if settings.EMAIL_TRANSPORT == "memory":
+        return InMemoryTransport()
+    return SMTPTransport(
+        host=settings.EMAIL_SMTP_HOST,
+        port=settings.EMAIL_SMTP_PORT,
+        username=settings.EMAIL_USER,
+        password=settings.EMAIL_PASSWORD,
+        timeout=settings.EMAIL_SMTP_TIMEOUT_SECONDS,
+        max_messages=settings.EMAIL_SMTP_MAX_MESSAGES_PER_CONNECTION
+    )
+
+
+email_dispatcher = EmailDispatcher(
+    transport_factory=create_transport,
+    workers=settings.EMAIL_WORKERS,
+    max_queue=settings.EMAIL_QUEUE_MAX_SIZE,
+    max_retries=settings.EMAIL_MAX_RETRIES,
+    retry_backoff_seconds=settings.EMAIL_RETRY_BACKOFF_SECONDS,
+    idle_seconds=settings.EMAIL_SMTP_IDLE_SECONDS
+)
@@ -0,0 +1,455 @@
+"""In-process metrics in the Prometheus text format.
+
+Every thread writes to its own shard of counters, so recording a sample
+takes no lock; shards are only merged when ``/metrics`` is scraped, or
+into a shared total when their thread exits.
+Counters are per worker process: each scrape answers for the worker that
+served it.
+"""
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+from blog_app.core.cache import caches
+from blog_app.db.pool import pool_report
+
+LabelValues = Tuple[str, ...]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class _ShardHolder:
+    """Owns a thread's shard; collected when the thread's locals are."""
+
+    __slots__ = ("values", "__weakref__")
+
+    def __init__(self):
+        self.values = {}
+
+
+class _Metric:
+    """A named metric whose values live in per-thread shards."""
+
+    type = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._local = threading.local()
+        # Live threads' shards by id, and the totals of threads that exited
+        self._shards: Dict[int, dict] = {}
+        self._retired: dict = {}
+        self._shards_lock = threading.Lock()
+
+    def _shard(self) -> dict:
+        try:
+            return self._local.holder.values
+        except AttributeError:
+            # Once per thread; later writes never touch the lock
+            holder = self._local.holder = _ShardHolder()
+            with self._shards_lock:
+                self._shards[id(holder.values)] = holder.values
+            # Threadpools retire idle threads, so fold a dead thread's shard
+            # into the totals rather than keep it forever
+            weakref.finalize(holder, self._retire, holder.values).atexit = False
+            return holder.values
+
+    def _retire(self, values: dict) -> None:
+        with self._shards_lock:
+            del self._shards[id(values)]
+            for labels, value in values.items():
+                retired = self._retired.get(labels)
+                # Replaced, never updated in place, so collected copies stay valid
+                self._retired[labels] = value if retired is None else self._merge(retired, value)
+
+    def _merge(self, total, value):
+        raise NotImplementedError
+
+    def _collect_shards(self) -> List[dict]:
+        with self._shards_lock:
+            shards = [dict(self._retired)] + list(self._shards.values())
+        # dict() copies in one step under the GIL, so owners may keep writing
+        return [dict(shard) for shard in shards]
+
+    def _labels(self, values: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, values)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonic counter."""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        shard = self._shard()
+        shard[labels] = shard.get(labels, 0.0) + amount
+
+    def _merge(self, total: float, value: float) -> float:
+        return total + value
+
+    def _samples(self) -> List[str]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in self._collect_shards():
+            for labels, value in shard.items():
+                totals[labels] = totals.get(labels, 0.0) + value
+        return [f"{self.name}{self._labels(labels)} {_number(value)}" for labels, value in sorted(totals.items())]
+
+
+class Histogram(_Metric):
+    """Bucketed distribution with a running sum and count."""
+
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        shard = self._shard()
+        # [count per bucket..., +Inf bucket, sum]
+        state = shard.get(labels)
+        if state is None:
+            state = shard[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        state[bisect_left(self.buckets, value)] += 1
+        state[-1] += value
+
+    def _merge(self, total: list, state: list) -> list:
+        return [a + b for a, b in zip(total, state)]
+
+    def _samples(self) -> List[str]:
+        totals: Dict[LabelValues, list] = {}
+        for shard in self._collect_shards():
+            for labels, state in shard.items():
+                state = list(state)
+                merged = totals.get(labels)
+                if merged is None:
+                    totals[labels] = state
+                else:
+                    totals[labels] = self._merge(merged, state)
+
+        lines = []
+        for labels, state in sorted(totals.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), state):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_labels = self._labels(labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(labels)} {_number(state[-1])}")
+            lines.append(f"{self.name}_count{self._labels(labels)} {cumulative}")
+        return lines
+
+
+class CallbackMetric(_Metric):
+    """Metric read from ``collect()`` at scrape time, for state kept elsewhere."""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        type: str,
+        collect: Callable[[], Dict[LabelValues, float]]
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.type = type
+        self._collect = collect
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(labels)} {_number(value)}" for labels, value in sorted(self._collect().items())]
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Ordered collection of metrics rendered together."""
+
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def callback(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        type: str,
+        collect: Callable[[], Dict[LabelValues, float]]
+    ) -> CallbackMetric:
+        metric = CallbackMetric(name, documentation, labelnames, type, collect)
+        self._metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """Return every metric in the Prometheus text exposition format."""
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "Time to send the full response.", ("method", "route")
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "Database statements executed per request.", ("method", "route"), COUNT_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Database time spent per request.", ("method", "route")
+)
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Time spent executing a single database statement.", (), QUERY_BUCKETS
+)
+password_hash_duration = registry.histogram(
+    "password_hash_duration_seconds", "bcrypt time per call, including the wait for a pool worker.", ("operation",)
+)
+password_hash_rejected = registry.counter(
+    "password_hash_rejected_total", "bcrypt calls rejected because the pool queue was full."
+)
+rate_limited = registry.counter(
+    "rate_limited_total", "Requests rejected with 429 by a rate limit.", ("limit",)
+)
+email_send_duration = registry.histogram(
+    "email_send_duration_seconds", "Time of one delivery attempt.", ("outcome",)
+)
+email_delivery_latency = registry.histogram(
+    "email_delivery_latency_seconds", "Time from queueing an email to its final outcome.", ("outcome",)
+)
+email_retries = registry.counter(
+    "email_retries_total", "Delivery attempts retried after a transient failure."
+)
+email_dropped = registry.counter(
+    "email_dropped_total", "Emails dropped because the send queue was full."
+)
+
+
+def _cache_stat(key: str) -> Callable[[], Dict[LabelValues, float]]:
+    """Collect one Cache.stats() field from every cache that reports it."""
+    def collect() -> Dict[LabelValues, float]:
+        values = {}
+        for cache in caches:
+            stats = cache.stats()
+            if key in stats:
+                values[(cache.namespace,)] = stats[key]
+        return values
+    return collect
+
+
+cache_hits = registry.callback(
+    "cache_hits_total", "Cache lookups answered from the cache.", ("cache",), "counter", _cache_stat("hits")
+)
+cache_misses = registry.callback(
+    "cache_misses_total", "Cache lookups that had to load the value.", ("cache",), "counter", _cache_stat("misses")
+)
+cache_evictions = registry.callback(
+    "cache_evictions_total", "Entries dropped to stay within the cache size (memory backend).", ("cache",), "counter", _cache_stat("evictions")
+)
+cache_entries = registry.callback(
+    "cache_entries", "Entries held by the cache in this worker (memory backend).", ("cache",), "gauge", _cache_stat("size")
+)
+
+
+# Connection pools registered by instrument_pool, by label
+_pools: Dict[str, object] = {}
+
+
+def _pool_stat(key: str) -> Callable[[], Dict[LabelValues, float]]:
+    """Collect one pool_report() field from every registered pool that reports it."""
+    def collect() -> Dict[LabelValues, float]:
+        values = {}
+        for name, pool in _pools.items():
+            report = pool_report(pool)
+            if key in report:
+                values[(name,)] = report[key]
+        return values
+    return collect
+
+
+def instrument_pool(name: str, pool) -> None:
+    """Export a connection pool's occupancy and checkout timings, labelled ``name``."""
+    _pools[name] = pool
+
+
+db_pool_size = registry.callback(
+    "db_pool_size", "Connections the pool keeps open.", ("pool",), "gauge", _pool_stat("size")
+)
+db_pool_checked_out = registry.callback(
+    "db_pool_checked_out", "Connections in use.", ("pool",), "gauge", _pool_stat("checked_out")
+)
+db_pool_checked_in = registry.callback(
+    "db_pool_checked_in", "Idle connections in the pool.", ("pool",), "gauge", _pool_stat("checked_in")
+)
+db_pool_overflow = registry.callback(
+    "db_pool_overflow", "Connections open beyond the pool size.", ("pool",), "gauge", _pool_stat("overflow")
+)
+db_pool_checkouts = registry.callback(
+    "db_pool_checkouts_total", "Connections handed out by the pool.", ("pool",), "counter", _pool_stat("checkouts")
+)
+db_pool_timeouts = registry.callback(
+    "db_pool_timeouts_total", "Checkouts that gave up after the pool timeout.", ("pool",), "counter", _pool_stat("timeouts")
+)
+db_pool_wait = registry.callback(
+    "db_pool_wait_seconds_total", "Time spent waiting for a connection, including opening one.", ("pool",), "counter",
+    _pool_stat("wait_seconds_total")
+)
+db_pool_wait_max = registry.callback(
+    "db_pool_wait_seconds_max", "Longest wait for a connection since the worker started.", ("pool",), "gauge",
+    _pool_stat("wait_seconds_max")
+)
+
+
+def serve_metrics(port: int) -> None:
+    """Serve the registry at ``/metrics`` from a daemon thread.
+
+    For worker processes, whose samples never reach the web app's scrape
+    endpoint.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = registry.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), Handler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+
+
+class RequestStats:
+    """Database work done on behalf of the current request."""
+
+    __slots__ = ("queries", "db_seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+
+
+# Threadpool and run_sync calls copy the context, so CRUD code sees (and
+# mutates) the object set by the middleware
+current_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("current_request_stats", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+    db_query_duration.observe(elapsed)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get("query_start_time")
+        if starts:
+            starts.pop()
+
+
+def instrument_engine(engine) -> None:
+    """Time every statement run through a sync ``Engine``."""
+    from sqlalchemy import event
+
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route request metrics.
+
+    Routes are labelled by their path template (``/api/blog/{slug}``) so
+    label cardinality stays bounded; unmatched paths share one label.
+    Timing stops when the last body chunk is sent, before background tasks.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+        status_code = 500
+        finished = False
+
+        def finish():
+            nonlocal finished
+            finished = True
+            route = scope.get("route")
+            labels = (scope["method"], route.path if route is not None else "<unmatched>")
+            http_requests.inc(*labels, str(status_code))
+            http_request_duration.observe(time.perf_counter() - start, *labels)
+            http_request_db_queries.observe(stats.queries, *labels)
+            http_request_db_duration.observe(stats.db_seconds, *labels)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+            if message["type"] == "http.response.body" and not message.get("more_body", False) and not finished:
+                finish()
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            if not finished:
+                finish()
+            current_request_stats.reset(token)
@@ -0,0 +1,194 @@
+import logging
+import threading
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Dict, List
+from starlette.concurrency import run_in_threadpool
+from blog_app.core.cache import get_redis_client
+from blog_app.core.config import settings
+from blog_app.core.metrics import rate_limited
+
+logger = logging.getLogger(__name__)
+
+_PERIODS = {"second": 1, "minute": 60, "hour": 3600, "day": 86400}
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """``count`` requests per ``period_seconds``, all of which may arrive at once."""
+    count: int
+    period_seconds: float
+
+    @classmethod
+    def parse(cls, value: str) -> "RateLimit":
+        """Parse ``"<count>/<second|minute|hour|day>"``, e.g. ``"5/minute"``."""
+        count, _, unit = value.partition("/")
+        if unit not in _PERIODS or not count.isdigit() or int(count) < 1:
+            raise ValueError(f"Invalid rate limit {value!r}; expected e.g. '5/minute'")
+        return cls(int(count), _PERIODS[unit])
+
+    @property
+    def interval(self) -> float:
+        """Seconds each request adds to the key's theoretical arrival time."""
+        return self.period_seconds / self.count
+
+
+class RateLimitBackend(ABC):
+    """Stores one GCRA timestamp per key."""
+
+    # True when acquire() does network I/O and must run off the event loop
+    blocking = False
+
+    @abstractmethod
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        """Record a request; return 0 if allowed, else seconds until it would be."""
+
+    @abstractmethod
+    def release(self, key: str, limit: RateLimit) -> None:
+        """Take back one request recorded by ``acquire``."""
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """Per-process GCRA state in lock-sharded dicts.
+
+    A key's only state is its theoretical arrival time (TAT). Once the TAT
+    is in the past the key is back to a full burst and its entry can go;
+    each shard sweeps such entries when it outgrows its share of
+    ``max_keys``, and drops its oldest entries if that is not enough.
+    """
+
+    def __init__(self, max_keys: int, shards: int = 16):
+        self.shard_size = max(1, max_keys // shards)
+        self._shards: List[Dict[str, float]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        now = time.monotonic()
+        with self._locks[index]:
+            tat = max(shard.get(key, now), now) + limit.interval
+            retry_after = tat - limit.period_seconds - now
+            if retry_after > 0:
+                return retry_after
+            # Re-insert so dict order stays oldest-update first
+            shard.pop(key, None)
+            shard[key] = tat
+            if len(shard) > self.shard_size:
+                self._sweep(shard, now)
+        return 0.0
+
+    def release(self, key: str, limit: RateLimit) -> None:
+        index = hash(key) % len(self._shards)
+        shard = self._shards[index]
+        with self._locks[index]:
+            if key in shard:
+                shard[key] -= limit.interval
+
+    def _sweep(self, shard: Dict[str, float], now: float) -> None:
+        for key in [key for key, tat in shard.items() if tat <= now]:
+            del shard[key]
+        while len(shard) > self.shard_size:
+            # Forgetting a key only makes it more lenient
+            del shard[next(iter(shard))]
+
+
+# KEYS[1] = key; ARGV = interval ms, period ms. Uses the server clock so
+# every worker agrees on "now".
+_GCRA_SCRIPT = """
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+local tat = tonumber(redis.call('GET', KEYS[1]) or now)
+if tat < now then tat = now end
+tat = tat + tonumber(ARGV[1])
+local retry_after = tat - tonumber(ARGV[2]) - now
+if retry_after > 0 then return retry_after end
+redis.call('SET', KEYS[1], tat, 'PX', tat - now)
+return 0
+"""
+
+# KEYS[1] = key; ARGV = interval ms. Moves the TAT back by one request.
+_RELEASE_SCRIPT = """
+local tat = tonumber(redis.call('GET', KEYS[1]))
+if not tat then return 0 end
+local t = redis.call('TIME')
+local now = t[1] * 1000 + math.floor(t[2] / 1000)
+tat = tat - tonumber(ARGV[1])
+if tat <= now then redis.call('DEL', KEYS[1]) else redis.call('SET', KEYS[1], tat, 'PX', tat - now) end
+return 0
+"""
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """GCRA state shared by all workers, updated atomically by a Lua script."""
+
+    blocking = True
+
+    def __init__(self, client, prefix: str = "ratelimit:"):
+        self.prefix = prefix
+        self._script = client.register_script(_GCRA_SCRIPT)
+        self._release_script = client.register_script(_RELEASE_SCRIPT)
+
+    def acquire(self, key: str, limit: RateLimit) -> float:
+        retry_after_ms = self._script(
+            keys=[self.prefix + key],
+            args=[int(limit.interval * 1000), int(limit.period_seconds * 1000)]
+        )
+        return int(retry_after_ms) / 1000
+
+    def release(self, key: str, limit: RateLimit) -> None:
+        self._release_script(keys=[self.prefix + key], args=[int(limit.interval * 1000)])
+
+
+class RateLimiter:
+    """Checks requests against named rate limits (GCRA, O(1) per check)."""
+
+    def __init__(self, backend: RateLimitBackend, limits: Dict[str, RateLimit]):
+        self.backend = backend
+        self.limits = limits
+
+    async def hit(self, name: str, identity: str) -> float:
+        """Count a request by ``identity`` against limit ``name``; return 0 if allowed, else seconds to wait."""
+        key = f"{name}:{identity}"
+        limit = self.limits[name]
+        try:
+            if self.backend.blocking:
+                retry_after = await run_in_threadpool(self.backend.acquire, key, limit)
+            else:
+                retry_after = self.backend.acquire(key, limit)
+        except Exception:
+            # An unavailable shared store must not take logins down with it
+            logger.exception("Rate limit check failed for %s; allowing", name)
+            return 0.0
+        if retry_after:
+            rate_limited.inc(name)
+        return retry_after
+
+    async def refund(self, name: str, identity: str) -> None:
+        """Take back an allowed ``hit``, e.g. once a login turns out to be genuine."""
+        key = f"{name}:{identity}"
+        limit = self.limits[name]
+        try:
+            if self.backend.blocking:
+                await run_in_threadpool(self.backend.release, key, limit)
+            else:
+                self.backend.release(key, limit)
+        except Exception:
+            logger.exception("Rate limit refund failed for %s", name)
+
+
+def _create_backend() -> RateLimitBackend:
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimitBackend(get_redis_client())
+    return InMemoryRateLimitBackend(settings.RATE_LIMIT_MAX_KEYS)
+
+
+rate_limiter = RateLimiter(_create_backend(), {
+    "signup:ip": RateLimit.parse(settings.RATE_LIMIT_SIGNUP_PER_IP),
+    "login:ip": RateLimit.parse(settings.RATE_LIMIT_LOGIN_PER_IP),
+    "login:email": RateLimit.parse(settings.RATE_LIMIT_LOGIN_PER_EMAIL),
+    "verify:ip": RateLimit.parse(settings.RATE_LIMIT_VERIFY_PER_IP),
+    "verify:email": RateLimit.parse(settings.RATE_LIMIT_VERIFY_PER_EMAIL),
+    "blog_write:user": RateLimit.parse(settings.RATE_LIMIT_BLOG_WRITE_PER_USER),
+})
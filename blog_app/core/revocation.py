@@ -0,0 +1,69 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import List, Optional
+from blog_app.core.cache import InvalidationBus, invalidation_bus, run_blocking
+from blog_app.core.config import settings
+
+
+class RevocationList:
+    """In-memory record of users whose issued tokens are no longer valid.
+
+    Used by the stateless auth mode, which trusts token claims instead of
+    reading the users table. A token is rejected if it was issued at or
+    before its user's revocation time. Entries are evicted once every token
+    issued before them has expired, so memory stays bounded. Revocations
+    are shared with other workers over the cache invalidation bus.
+    """
+
+    def __init__(self, ttl_seconds: int, bus: InvalidationBus):
+        self.ttl_seconds = ttl_seconds
+        self.bus = bus
+        self._origin = uuid.uuid4().hex
+        self._lock = threading.Lock()
+        # user_id -> revoked_at, oldest revocation first
+        self._revoked: "OrderedDict[int, float]" = OrderedDict()
+        bus.subscribe("revocation", self._on_message)
+
+    def revoke(self, user_id: int) -> None:
+        """Invalidate every token issued to a user up to now."""
+        revoked_at = time.time()
+        self._record(user_id, revoked_at)
+        run_blocking(self.bus, self.bus.publish, self._origin, "revocation", [f"{user_id}:{revoked_at}"])
+
+    def _on_message(self, origin: str, keys: List[str]) -> None:
+        if origin == self._origin:
+            return
+        for key in keys:
+            user_id, revoked_at = key.split(":")
+            self._record(int(user_id), float(revoked_at))
+
+    def _record(self, user_id: int, revoked_at: float) -> None:
+        with self._lock:
+            revoked_at = max(revoked_at, self._revoked.get(user_id, revoked_at))
+            self._revoked[user_id] = revoked_at
+            self._revoked.move_to_end(user_id)
+            self._evict(time.time())
+
+    def is_revoked(self, user_id: int, issued_at: Optional[int]) -> bool:
+        """Check whether a token issued at ``issued_at`` has been revoked."""
+        with self._lock:
+            self._evict(time.time())
+            revoked_at = self._revoked.get(user_id)
+        if revoked_at is None:
+            return False
+        return issued_at is None or issued_at <= revoked_at
+
+    def _evict(self, now: float) -> None:
+        while self._revoked:
+            user_id, revoked_at = next(iter(self._revoked.items()))
+            if now - revoked_at < self.ttl_seconds:
+                break
+            del self._revoked[user_id]
+
+
+revocation_list = RevocationList(
+    ttl_seconds=settings.ACCESS_TOKEN_EXPIRE_MINUTES * 60,
+    bus=invalidation_bus
+)
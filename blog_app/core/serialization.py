@@ -0,0 +1,53 @@
+"""Optional orjson fast path for JSON responses.
+
+With FAST_JSON enabled the app's default response class is ORJSONResponse,
+and routes whose payload comes straight from the database can return it
+through ``trusted_response``. That skips building and re-validating
+Pydantic models for rows whose types the schema already guarantees.
+"""
+from typing import Any, Type, Union
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel
+from blog_app.core.config import settings
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if settings.FAST_JSON and orjson is None:
+    raise RuntimeError("The orjson package is required for FAST_JSON")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode trusted content as JSON bytes."""
+    # OPT_UTC_Z writes UTC datetimes with a "Z" suffix, as Pydantic does
+    return orjson.dumps(content, option=orjson.OPT_UTC_Z)
+
+
+class TrustedJSONResponse(Response):
+    """JSON response rendered by orjson without any validation."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def default_response_class() -> Type[JSONResponse]:
+    """Response class for routes that return models or dicts."""
+    return ORJSONResponse if settings.FAST_JSON else JSONResponse
+
+
+def trusted_response(model: Type[BaseModel], **content: Any) -> Union[BaseModel, Response]:
+    """Return ``content`` as ``model``, or serialise it directly in FAST_JSON mode."""
+    if settings.FAST_JSON:
+        return TrustedJSONResponse(content)
+    return model(**content)
+
+
+def encode_model(model: Type[BaseModel], content: dict) -> bytes:
+    """JSON bytes of ``content`` validated as ``model``, unvalidated in FAST_JSON mode."""
+    if settings.FAST_JSON:
+        return dumps(content)
+    return model(**content).model_dump_json().encode()
@@ -1,4 +1,6 @@
 from .user import user_crud
 from .blog import blog_crud
+from .email_outbox import email_outbox_crud
+from .async_crud import async_user_crud, async_blog_crud
 
-__all__ = ["user_crud", "blog_crud"] 
\ No newline at end of file
+__all__ = ["user_crud", "blog_crud", "email_outbox_crud", "async_user_crud", "async_blog_crud"]
\ No newline at end of file
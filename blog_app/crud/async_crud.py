@@ -0,0 +1,56 @@
+import functools
+from typing import Any, AsyncIterator, Iterator, List
+from sqlalchemy import Row, Select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
+from blog_app.crud.blog import blog_crud
+from blog_app.crud.user import user_crud
+
+
+class AsyncCRUD:
+    """Awaitable view over a sync CRUD object.
+
+    Each method takes the same arguments as its sync counterpart. With an
+    ``AsyncSession`` it runs through ``run_sync`` on the async driver; with a
+    plain ``Session`` it runs in the threadpool. Either way the event loop
+    is never blocked on a database round-trip.
+    """
+
+    def __init__(self, crud: Any):
+        self._crud = crud
+
+    def __getattr__(self, name: str):
+        method = getattr(self._crud, name)
+        if not callable(method):
+            return method
+
+        @functools.wraps(method)
+        async def call(db, *args, **kwargs):
+            if isinstance(db, AsyncSession):
+                return await db.run_sync(method, *args, **kwargs)
+            return await run_in_threadpool(method, db, *args, **kwargs)
+
+        setattr(self, name, call)
+        return call
+
+
+def _iter_partitions(db, stmt: Select, batch_size: int) -> Iterator[List[Row]]:
+    yield from db.execute(stmt.execution_options(yield_per=batch_size)).partitions()
+
+
+async def stream_partitions(db, stmt: Select, batch_size: int) -> AsyncIterator[List[Row]]:
+    """Yield a query's rows in lists of ``batch_size`` from a server-side cursor.
+
+    Only one batch is held in memory at a time, whichever session type is used.
+    """
+    if isinstance(db, AsyncSession):
+        result = await db.stream(stmt.execution_options(yield_per=batch_size))
+        async for partition in result.partitions():
+            yield partition
+    else:
+        async for partition in iterate_in_threadpool(_iter_partitions(db, stmt, batch_size)):
+            yield partition
+
+
+async_user_crud = AsyncCRUD(user_crud)
+async_blog_crud = AsyncCRUD(blog_crud)
@@ -1,27 +1,103 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import select
-from typing import List, Tuple
-from blog_app.db.models.blog import Blog
+import json
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import Float, Select, cast, delete, func, insert, select, text, true, tuple_, update
+from typing import List, Optional, Tuple
+from datetime import datetime, timezone
+from blog_app.core.cache import create_cache
+from blog_app.core.config import settings
+from blog_app.db.models.blog import Blog, BlogArchive, SEARCH_CONFIG
 from blog_app.db.models.user import User
+from blog_app.db.ids import IdAllocator
 from blog_app.schemas.blog import BlogCreate, BlogResponse, BlogWithoutBody, BlogUpdate
-from blog_app.utils.blog import generate_slug
+from blog_app.utils.blog import generate_slug, generate_slugs, encode_cursor, encode_rank_cursor
+
+
+class BlogNotFound(Exception):
+    """Raised when a write targets a slug with no live blog."""
+
+
+class NotBlogAuthor(Exception):
+    """Raised when a write targets another user's blog."""
 
 
 class BlogCRUD:
-    def create_blog(self, db: Session, author_id: int, blog_data: BlogCreate) -> Blog:
+    def __init__(self):
+        # Ids are reserved up front so the slug can be written with the row
+        self.id_allocator = IdAllocator("blogs_id_seq", block_size=settings.BLOG_ID_BLOCK_SIZE)
+        # "live" -> number of live blogs, for BLOG_COUNT_STRATEGY=cached
+        self.count_cache = create_cache(
+            "blog_count",
+            max_size=1,
+            ttl_seconds=settings.BLOG_COUNT_CACHE_TTL_SECONDS
+        )
+        # slug -> CachedResponse for GET /api/blog/{slug}
+        self.response_cache = create_cache(
+            "blog_response",
+            max_size=settings.BLOG_RESPONSE_CACHE_MAX_SIZE,
+            ttl_seconds=settings.BLOG_RESPONSE_CACHE_TTL_SECONDS
+        )
+
+    def create_blog(self, db: Session, author_id: int, blog_data: BlogCreate) -> dict:
         """Create a new blog."""
-        db_blog = Blog(
+        blog_id = self.id_allocator.allocate(db)[0]
+        stmt = insert(Blog).values(
+            id=blog_id,
             title=blog_data.title,
+            slug=generate_slug(blog_data.title, blog_id),
             excerpt=blog_data.excerpt,
             content=blog_data.content,
-            author_id=author_id
-        )
-        db.add(db_blog)
-        db.flush()
-        db_blog.slug = generate_slug(blog_data.title, db_blog.id)
+            author_id=author_id,
+            # Set on creation too, as the old insert-then-set-slug flow did
+            updated_at=func.now()
+        ).returning(Blog.id, Blog.slug, Blog.created_at)
+        blog = db.execute(stmt).one()._asdict()
+        db.commit()
+        self.count_cache.invalidate("live")
+        return blog
+
+    def bulk_create_blogs(self, db: Session, author_id: int, blogs: List[BlogCreate]) -> int:
+        """Insert a batch of blogs with one id fetch and one multi-row INSERT."""
+        if not blogs:
+            return 0
+        ids = self.id_allocator.allocate(db, len(blogs))
+        slugs = generate_slugs([blog.title for blog in blogs], ids)
+        now = datetime.now(timezone.utc)
+        db.execute(insert(Blog), [
+            {
+                "id": blog_id,
+                "title": blog.title,
+                "slug": slug,
+                "excerpt": blog.excerpt,
+                "content": blog.content,
+                "author_id": author_id,
+                "created_at": now,
+                "updated_at": now,
+                "is_deleted": False
+            }
+            for blog_id, slug, blog in zip(ids, slugs, blogs)
+        ])
         db.commit()
-        db.refresh(db_blog)
-        return db_blog
+        self.count_cache.invalidate("live")
+        return len(blogs)
+
+    def export_statement(self) -> Select:
+        """Every live blog with its body and author, oldest first."""
+        return (
+            select(
+                Blog.id,
+                Blog.title,
+                Blog.slug,
+                Blog.excerpt,
+                Blog.content,
+                Blog.created_at,
+                Blog.updated_at,
+                Blog.author_id,
+                User.username.label("author_username")
+            )
+            .join(User, Blog.author_id == User.id)
+            .filter(Blog.is_deleted == False)
+            .order_by(Blog.id)
+        )
 
     def get_blog_by_slug(self, db: Session, slug: str) -> BlogResponse:
         """Get a blog by slug."""
@@ -44,9 +120,9 @@ class BlogCRUD:
         result = db.execute(stmt).first()
         return result._asdict() if result else None
 
-    def get_all_blogs(self, db: Session, skip: int, limit: int) -> Tuple[List[BlogWithoutBody], int]:
-        """Get all blogs."""
-        base_query = db.query(
+    def _live_blogs_query(self, db: Session) -> Query:
+        """Listing columns of every non-deleted blog."""
+        return db.query(
                     Blog.id,
                     Blog.title,
                     Blog.slug,
@@ -62,36 +138,152 @@ class BlogCRUD:
                     Blog.is_deleted == False
                 )
 
-        total_count = base_query.count()
+    def get_all_blogs(
+        self,
+        db: Session,
+        skip: int,
+        limit: int,
+        cursor: Optional[Tuple[datetime, int]] = None
+    ) -> Tuple[List[BlogWithoutBody], Optional[str]]:
+        """Get a page of blogs, newest first, and the cursor of the next page.
 
-        blogs = base_query.offset(skip).limit(limit).all()
+        When a decoded ``cursor`` is given, rows are fetched with a keyset
+        predicate on ``(created_at, id)`` and ``skip`` is ignored.
+        """
+        page_query = self._live_blogs_query(db).order_by(Blog.created_at.desc(), Blog.id.desc())
+        if cursor is not None:
+            page_query = page_query.filter(tuple_(Blog.created_at, Blog.id) < tuple_(*cursor))
+        else:
+            page_query = page_query.offset(skip)
 
-        return [row._asdict() for row in blogs] if blogs else [], total_count
+        # Fetch one extra row to know whether another page exists.
+        blogs = page_query.limit(limit + 1).all()
+        next_cursor = None
+        if len(blogs) > limit:
+            blogs = blogs[:limit]
+            next_cursor = encode_cursor(blogs[-1].created_at, blogs[-1].id)
 
-    def delete_blog(self, db: Session, blog_id: int) -> None:
-        """Delete a blog."""
-        stmt = (
-            select(Blog)
-            .filter(Blog.id == blog_id)
+        return [row._asdict() for row in blogs] if blogs else [], next_cursor
+
+    def search_blogs(
+        self,
+        db: Session,
+        query: str,
+        limit: int,
+        cursor: Optional[Tuple[float, int]] = None
+    ) -> Tuple[List[BlogWithoutBody], Optional[str]]:
+        """Full-text search over live blogs, best match first.
+
+        ``query`` uses web search syntax (quoted phrases, ``or``, ``-word``).
+        Pages are keyed on ``(rank, id)``.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        # ts_rank returns real; widen it so the value round-trips exactly through the cursor
+        rank = cast(func.ts_rank(Blog.search_vector, ts_query), Float(precision=53))
+        page_query = self._live_blogs_query(db).add_columns(rank.label("rank")).filter(
+            Blog.search_vector.op("@@")(ts_query)
+        ).order_by(rank.desc(), Blog.id.desc())
+        if cursor is not None:
+            page_query = page_query.filter(tuple_(rank, Blog.id) < tuple_(*cursor))
+
+        blogs = page_query.limit(limit + 1).all()
+        next_cursor = None
+        if len(blogs) > limit:
+            blogs = blogs[:limit]
+            next_cursor = encode_rank_cursor(blogs[-1].rank, blogs[-1].id)
+
+        results = []
+        for row in blogs:
+            blog = row._asdict()
+            del blog["rank"]
+            results.append(blog)
+        return results, next_cursor
+
+    def count_blogs(self, db: Session, estimated: bool = False) -> int:
+        """Count live blogs, or return the planner's estimate if ``estimated``."""
+        base_query = self._live_blogs_query(db)
+        if estimated:
+            return self._estimate_row_count(db, base_query)
+        return base_query.count()
+
+    def _estimate_row_count(self, db: Session, base_query: Query) -> int:
+        """Return the planner's row estimate for a query without executing it."""
+        compiled = base_query.statement.compile(
+            dialect=db.get_bind().dialect,
+            compile_kwargs={"literal_binds": True}
         )
-        result = db.execute(stmt).scalar_one_or_none()
-        if result:
-            result.is_deleted = True
-            db.commit()
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {compiled}")).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    def _update_owned(self, db: Session, slug: str, author_id: int, values: dict) -> int:
+        """Update a live blog owned by ``author_id`` in one statement; returns its id.
+
+        Raises BlogNotFound or NotBlogAuthor when nothing was updated.
+        """
+        target = select(Blog.id, Blog.author_id).where(Blog.slug == slug, Blog.is_deleted == False).cte("target")
+        updated = (
+            update(Blog)
+            .where(Blog.id == target.c.id, target.c.author_id == author_id)
+            .values(**values)
+            .returning(Blog.id)
+            .cte("updated")
+        )
+        # Left join so one row tells "not found" (no row) from "not yours" (no id)
+        stmt = select(target.c.author_id, updated.c.id).select_from(target.outerjoin(updated, true()))
+        row = db.execute(stmt).one_or_none()
+        db.commit()
+        if row is None:
+            raise BlogNotFound()
+        if row.id is None:
+            raise NotBlogAuthor()
+        return row.id
+
+    def delete_blog(self, db: Session, slug: str, author_id: int) -> int:
+        """Soft-delete a blog owned by ``author_id``."""
+        blog_id = self._update_owned(db, slug, author_id, {"is_deleted": True, "deleted_at": func.now(), "updated_at": func.now()})
+        self.count_cache.invalidate("live")
+        self.response_cache.invalidate(slug)
+        return blog_id
     
-    def update_blog(self, db: Session, blog_id: int, blog_data: BlogUpdate) -> Blog:
-        """Update a blog."""
+    def update_blog(self, db: Session, slug: str, author_id: int, blog_data: BlogUpdate) -> int:
+        """Update a blog owned by ``author_id``."""
+        blog_id = self._update_owned(db, slug, author_id, {
+            "title": blog_data.title,
+            "excerpt": blog_data.excerpt,
+            "content": blog_data.content,
+            "updated_at": func.now()
+        })
+        self.response_cache.invalidate(slug)
+        return blog_id
+
+    def archive_deleted_blogs(self, db: Session, older_than_days: int, batch_size: int) -> int:
+        """Move up to ``batch_size`` blogs deleted over ``older_than_days`` ago to blogs_archive.
+
+        The rows are deleted and inserted by one statement, so a batch is
+        either fully moved or not at all. Returns the number moved.
+        """
+        columns = ["id", "title", "slug", "excerpt", "content", "author_id", "created_at", "updated_at", "deleted_at"]
+        due = (
+            select(Blog.id)
+            .where(Blog.is_deleted == True, Blog.deleted_at < func.now() - func.make_interval(0, 0, 0, older_than_days))
+            .limit(batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        moved = (
+            delete(Blog)
+            .where(Blog.id.in_(due))
+            .returning(*(Blog.__table__.c[name] for name in columns))
+            .cte("moved")
+        )
         stmt = (
-            select(Blog)
-            .filter(Blog.id == blog_id, Blog.is_deleted == False)
+            insert(BlogArchive)
+            .from_select(columns, select(*(moved.c[name] for name in columns)))
+            .add_cte(moved)
         )
-        db_blog = db.execute(stmt).scalar_one_or_none()
-        if db_blog:
-            db_blog.title = blog_data.title
-            db_blog.excerpt = blog_data.excerpt
-            db_blog.content = blog_data.content
-            db.commit()
-            db.refresh(db_blog)
-        return db_blog
+        result = db.execute(stmt)
+        db.commit()
+        return result.rowcount
 
 blog_crud = BlogCRUD()
\ No newline at end of file
@@ -0,0 +1,35 @@
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from blog_app.db.models.email import EmailOutbox
+
+
+class EmailOutboxCRUD:
+    def claim_batch(self, db: Session, limit: int) -> List[EmailOutbox]:
+        """Lock up to ``limit`` due emails that no other worker has locked."""
+        stmt = (
+            select(EmailOutbox)
+            .where(EmailOutbox.failed_at.is_(None), EmailOutbox.available_at <= datetime.now(timezone.utc))
+            .order_by(EmailOutbox.available_at, EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        return list(db.scalars(stmt))
+
+    def mark_sent(self, db: Session, row: EmailOutbox) -> None:
+        """Remove a delivered email."""
+        db.delete(row)
+
+    def mark_failed(self, db: Session, row: EmailOutbox, error: str, retry_in_seconds: Optional[float] = None) -> None:
+        """Record a failed attempt; without ``retry_in_seconds`` the email is given up on."""
+        now = datetime.now(timezone.utc)
+        row.attempts += 1
+        row.last_error = error[:1000]
+        if retry_in_seconds is None:
+            row.failed_at = now
+        else:
+            row.available_at = now + timedelta(seconds=retry_in_seconds)
+
+
+email_outbox_crud = EmailOutboxCRUD()
@@ -1,101 +1,214 @@
+from dataclasses import dataclass
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from typing import Optional
+from sqlalchemy import delete, func, insert, select, true, update
+from sqlalchemy.exc import IntegrityError
+from typing import Callable, Optional, Tuple
 from datetime import datetime, timedelta, timezone
 from blog_app.db.models.user import User, OTP
+from blog_app.db.models.email import EmailOutbox
 from blog_app.schemas.user import UserCreate
-from blog_app.core.security import get_password_hash, verify_password
+from blog_app.core.cache import create_cache
+from blog_app.core.config import settings
+from blog_app.core.revocation import revocation_list
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Immutable copy of a user row, safe to share across sessions."""
+    id: int
+    email: str
+    username: str
+    full_name: str
+    hashed_password: str
+    verified: bool
+    is_active: bool
+    created_at: Optional[datetime]
+    updated_at: Optional[datetime]
+
+    @classmethod
+    def from_orm(cls, user: User) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            hashed_password=user.hashed_password,
+            verified=user.verified,
+            is_active=user.is_active,
+            created_at=user.created_at,
+            updated_at=user.updated_at
+        )
+
+
+class UserAlreadyExists(Exception):
+    """Raised when signup hits the unique email or username index."""
+
+    def __init__(self, field: str):
+        super().__init__(f"{field} already in use")
+        self.field = field
+
+
+# Unique indexes on users and the field each one protects
+_UNIQUE_FIELDS = {"ix_users_email": "email", "ix_users_username": "username"}
+
+
+def _violated_constraint(exc: IntegrityError) -> Optional[str]:
+    """Name of the constraint behind an IntegrityError, for psycopg2 and asyncpg."""
+    diag = getattr(exc.orig, "diag", None)
+    if diag is not None:
+        return diag.constraint_name
+    return getattr(exc.orig.__cause__, "constraint_name", None)
+
+
+_SNAPSHOT_COLUMNS = [getattr(User, name) for name in UserSnapshot.__dataclass_fields__]
 
 
 class UserCRUD:
-    def create_user(self, db: Session, user_data: UserCreate) -> User:
-        """Create a new user."""
-        hashed_password = get_password_hash(user_data.password)
-        db_user = User(
+    def __init__(self):
+        # "id:<id>" -> UserSnapshot; "email:<email>" -> "id:<id>".
+        # Emails never change, so invalidating the id entry is enough.
+        self.cache = create_cache(
+            "user",
+            max_size=settings.USER_CACHE_MAX_SIZE,
+            ttl_seconds=settings.USER_CACHE_TTL_SECONDS
+        )
+
+    def register_user(
+        self,
+        db: Session,
+        user_data: UserCreate,
+        hashed_password: str,
+        otp_code: str,
+        expires_in_minutes: int = 10
+    ) -> UserSnapshot:
+        """Create a user with a fresh OTP (and outbox email) in one statement.
+
+        Raises UserAlreadyExists when the email or username is taken.
+        """
+        new_user = insert(User).values(
             email=user_data.email,
             username=user_data.username,
             full_name=user_data.full_name,
             hashed_password=hashed_password,
-            verified=False
-        )
-        db.add(db_user)
+            verified=False,
+            is_active=True
+        ).returning(*_SNAPSHOT_COLUMNS).cte("new_user")
+        # Data-modifying CTEs all see the snapshot from before the statement,
+        # so retiring old OTPs cannot touch the one inserted alongside.
+        # Python-side column defaults are not applied inside CTEs, so every
+        # non-nullable value is given explicitly.
+        retired_otps = update(OTP).where(OTP.email == user_data.email, OTP.is_used == False).values(is_used=True).cte("retired_otps")
+        new_otp = insert(OTP).values(
+            email=user_data.email,
+            otp_code=otp_code,
+            is_used=False,
+            expires_at=datetime.now(timezone.utc) + timedelta(minutes=expires_in_minutes)
+        ).cte("new_otp")
+        stmt = select(new_user).add_cte(retired_otps, new_otp)
+        if settings.EMAIL_DELIVERY == "outbox":
+            stmt = stmt.add_cte(insert(EmailOutbox).values(
+                kind="verification",
+                recipient=user_data.email,
+                payload={"otp_code": otp_code}
+            ).cte("new_outbox"))
+
+        try:
+            row = db.execute(stmt).one()
+            db.commit()
+        except IntegrityError as exc:
+            db.rollback()
+            field = _UNIQUE_FIELDS.get(_violated_constraint(exc))
+            if field is None:
+                raise
+            raise UserAlreadyExists(field) from exc
+        return UserSnapshot(**row._mapping)
+
+    def verify_email(self, db: Session, email: str, otp_code: str) -> Tuple[bool, Optional[UserSnapshot]]:
+        """Consume a valid OTP and mark its user verified in one statement.
+
+        Returns whether the OTP was valid and the verified user, if found.
+        """
+        used_otp = update(OTP).where(
+            OTP.email == email,
+            OTP.otp_code == otp_code,
+            OTP.is_used == False,
+            OTP.expires_at > func.now()
+        ).values(is_used=True).returning(OTP.email).cte("used_otp")
+        verified_user = update(User).where(
+            User.email == used_otp.c.email
+        ).values(verified=True, updated_at=func.now()).returning(*_SNAPSHOT_COLUMNS).cte("verified_user")
+        stmt = select(verified_user).select_from(used_otp.outerjoin(verified_user, true())).limit(1)
+
+        row = db.execute(stmt).one_or_none()
         db.commit()
-        db.refresh(db_user)
-        return db_user
-    
-    def get_user_by_email(self, db: Session, email: str) -> Optional[User]:
+        if row is None:
+            return False, None
+        if row.id is None:
+            return True, None
+        self.invalidate_user(row.id)
+        return True, UserSnapshot(**row._mapping)
+
+    def get_user_by_email(self, db: Session, email: str) -> Optional[UserSnapshot]:
         """Get user by email."""
-        return db.query(User).filter(User.email == email).first()
-    
-    def get_user_by_username(self, db: Session, username: str) -> Optional[User]:
-        """Get user by username."""
-        return db.query(User).filter(User.username == username).first()
+        return self._get_user(f"email:{email}", lambda: db.query(User).filter(User.email == email).first())
     
-    def get_user_by_id(self, db: Session, user_id: int) -> Optional[User]:
+    def get_user_by_id(self, db: Session, user_id: int) -> Optional[UserSnapshot]:
         """Get user by ID."""
-        return db.query(User).filter(User.id == user_id).first()
+        return self._get_user(f"id:{user_id}", lambda: db.query(User).filter(User.id == user_id).first())
+    
+    def invalidate_user(self, user_id: int) -> None:
+        """Drop a user from every worker's cache after it changes."""
+        self.cache.invalidate(f"id:{user_id}")
     
-    def authenticate_user(self, db: Session, email: str, password: str) -> Optional[User]:
-        """Authenticate user with email and password."""
-        user = self.get_user_by_email(db, email)
-        if not user or not verify_password(password, user.hashed_password):
+    def _get_user(self, key: str, load: Callable[[], Optional[User]]) -> Optional[UserSnapshot]:
+        """Look a user up in the cache, loading and caching it on a miss."""
+        if not settings.USER_CACHE_ENABLED:
+            user = load()
+            return UserSnapshot.from_orm(user) if user else None
+
+        id_key = key if key.startswith("id:") else self.cache.get(key)
+        if id_key is not None:
+            snapshot = self.cache.get(id_key)
+            if snapshot is not None:
+                return snapshot
+
+        generation = self.cache.generation
+        user = load()
+        if user is None:
             return None
-        return user
+        snapshot = UserSnapshot.from_orm(user)
+        id_key = f"id:{snapshot.id}"
+        self.cache.set(id_key, snapshot, generation)
+        self.cache.set(f"email:{snapshot.email}", id_key)
+        return snapshot
     
-    def verify_user(self, db: Session, user_id: int) -> Optional[User]:
-        """Mark user as verified."""
-        user = self.get_user_by_id(db, user_id)
+    def deactivate_user(self, db: Session, user_id: int) -> Optional[User]:
+        """Mark user as inactive and revoke their outstanding tokens."""
+        user = db.query(User).filter(User.id == user_id).first()
         if user:
-            user.verified = True
+            user.is_active = False
             db.commit()
             db.refresh(user)
+            self.invalidate_user(user.id)
+            revocation_list.revoke(user.id)
         return user
     
-    def create_otp(self, db: Session, email: str, otp_code: str, expires_in_minutes: int = 10) -> OTP:
-        """Create a new OTP for email verification."""
-        # Invalidate any existing OTPs for this email
-        db.query(OTP).filter(OTP.email == email).update({"is_used": True})
-
-        expires_at = datetime.now(timezone.utc) + timedelta(minutes=expires_in_minutes)
-        db_otp = OTP(
-            email=email,
-            otp_code=otp_code,
-            expires_at=expires_at
-        )
-        db.add(db_otp)
+    def update_password_hash(self, db: Session, user_id: int, hashed_password: str) -> None:
+        """Replace a user's password hash."""
+        db.query(User).filter(User.id == user_id).update({"hashed_password": hashed_password})
         db.commit()
-        db.refresh(db_otp)
-        return db_otp
-    
-    def verify_otp(self, db: Session, email: str, otp_code: str) -> Optional[OTP]:
-        """Verify OTP for email verification."""
-        current_time = datetime.now(timezone.utc)
-        otp = db.query(OTP).filter(
-            and_(
-                OTP.email == email,
-                OTP.otp_code == otp_code,
-                OTP.is_used == False,
-                OTP.expires_at > current_time
-            )
-        ).first()
-        
-        if otp:
-            otp.is_used = True
-            db.commit()
-            db.refresh(otp)
-            return otp
-        return None
-    
-    def get_active_otp(self, db: Session, email: str) -> Optional[OTP]:
-        """Get active OTP for email."""
-        current_time = datetime.now(timezone.utc)
-        return db.query(OTP).filter(
-            and_(
-                OTP.email == email,
-                OTP.is_used == False,
-                OTP.expires_at > current_time
-            )
-        ).first()
+        self.invalidate_user(user_id)
+
+    def purge_expired_otps(self, db: Session, batch_size: int) -> int:
+        """Delete up to ``batch_size`` expired OTPs and return how many went.
+
+        Used OTPs are deleted once they expire too. Rows locked by a
+        concurrent verify are skipped and picked up by a later batch.
+        """
+        expired = select(OTP.id).where(OTP.expires_at < func.now()).limit(batch_size).with_for_update(skip_locked=True)
+        result = db.execute(delete(OTP).where(OTP.id.in_(expired)))
+        db.commit()
+        return result.rowcount
 
 
 user_crud = UserCRUD() 
\ No newline at end of file
@@ -1,19 +1,61 @@
+import uuid
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from blog_app.core.config import settings
+from blog_app.db.pool import InstrumentedQueuePool, InstrumentedAsyncAdaptedQueuePool
+
+
+def _pool_options(pool_class) -> dict:
+    """Engine keyword arguments for the configured pooling mode."""
+    if settings.DB_PGBOUNCER:
+        # PgBouncer owns the pool; hold no idle connections here
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
 
 # Create database engine
 engine = create_engine(
     settings.DATABASE_URL,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.DEBUG
+    echo=settings.DEBUG,
+    **_pool_options(InstrumentedQueuePool)
 )
 
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Create async engine and session factory when the async stack is enabled
+async_engine = None
+AsyncSessionLocal = None
+if settings.DB_ASYNC:
+    connect_args = {}
+    if settings.DB_PGBOUNCER:
+        # Transaction-mode PgBouncer may hand each statement a different
+        # server connection, so named prepared statements must be unique
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+        }
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL or make_url(settings.DATABASE_URL).set(drivername="postgresql+asyncpg"),
+        echo=settings.DEBUG,
+        connect_args=connect_args,
+        **_pool_options(InstrumentedAsyncAdaptedQueuePool)
+    )
+    # Objects must stay readable after commit, outside the greenlet that loaded them
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 # Create base class for models
 Base = declarative_base()
 
@@ -24,4 +66,10 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    """Dependency to get async database session."""
+    async with AsyncSessionLocal() as db:
+        yield db
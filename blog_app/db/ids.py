@@ -0,0 +1,42 @@
+import threading
+from collections import deque
+from typing import List
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+
+class IdAllocator:
+    """Hands out primary keys drawn from a Postgres sequence in blocks.
+
+    One ``nextval`` round-trip reserves ``block_size`` ids, so most inserts
+    know their id before they run and can derive other columns from it in
+    the same statement. Unused ids are lost on restart, leaving gaps, which
+    sequences never promised to avoid anyway.
+    """
+
+    def __init__(self, sequence_name: str, block_size: int):
+        self.sequence_name = sequence_name
+        self.block_size = block_size
+        self._ids: deque = deque()
+        # Guards the deque only; never held across a database call
+        self._lock = threading.Lock()
+
+    def allocate(self, db: Session, count: int = 1) -> List[int]:
+        """Return ``count`` unused ids, fetching more from the sequence if needed."""
+        ids = self._take(count)
+        missing = count - len(ids)
+        if missing:
+            # Fetch what this call lacks plus the next block in one round-trip
+            fetched = self._fetch(db, missing + self.block_size)
+            ids.extend(fetched[:missing])
+            with self._lock:
+                self._ids.extend(fetched[missing:])
+        return ids
+
+    def _take(self, count: int) -> List[int]:
+        with self._lock:
+            return [self._ids.popleft() for _ in range(min(count, len(self._ids)))]
+
+    def _fetch(self, db: Session, count: int) -> List[int]:
+        stmt = select(func.nextval(self.sequence_name)).select_from(func.generate_series(1, count))
+        return list(db.scalars(stmt))
@@ -0,0 +1,174 @@
+"""Per-request SQL inspection for development and staging.
+
+With ``QUERY_INSPECTOR_ENABLED`` the middleware groups every statement a
+request runs by its fingerprint (the SQL with literals and parameter
+names normalised away). It logs statements slower than
+``SLOW_QUERY_THRESHOLD_MS`` and fingerprints repeated at least
+``N_PLUS_ONE_THRESHOLD`` times, which is the usual sign of a lazy
+relationship loaded in a loop.
+
+``assert_max_queries`` is independent of the setting and is meant for
+tests::
+
+    with assert_max_queries(2):
+        client.get("/api/blog/")
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterable, List, Optional
+from sqlalchemy import event
+from blog_app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM = re.compile(r"%\([^)]+\)s|%s|\$\d+|\?")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(statement: str) -> str:
+    """Normalise a statement so executions differing only in values match."""
+    sql = _STRING.sub("?", statement)
+    sql = _PARAM.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _SPACE.sub(" ", sql).strip()
+    return _IN_LIST.sub("IN (?)", sql)
+
+
+def _route_of(scope: dict) -> str:
+    route = scope.get("route")
+    path = route.path if route is not None else scope.get("path", "")
+    return f"{scope.get('method', '')} {path}"
+
+
+class RequestQueries:
+    """Statements executed while serving one request."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.counts: Counter = Counter()
+        self.seconds: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        # Routing fills in scope["route"] after the middleware has started
+        return _route_of(self.scope)
+
+    def record(self, statement: str, elapsed: float) -> None:
+        key = fingerprint(statement)
+        self.counts[key] += 1
+        self.seconds[key] += elapsed
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        """(fingerprint, count, seconds) for statements run at least ``threshold`` times."""
+        return [
+            (key, count, self.seconds[key])
+            for key, count in self.counts.most_common()
+            if count >= threshold
+        ]
+
+
+_current_queries: ContextVar[Optional[RequestQueries]] = ContextVar("current_queries", default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("inspector_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["inspector_start_time"].pop()
+    queries = _current_queries.get()
+    if queries is not None:
+        queries.record(statement, elapsed)
+    if elapsed * 1000 >= settings.SLOW_QUERY_THRESHOLD_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000,
+            queries.route if queries is not None else "<no request>",
+            _SPACE.sub(" ", statement).strip()
+        )
+
+
+def _handle_error(context):
+    # A failed statement never reaches after_cursor_execute
+    if context.connection is not None and context.execution_context is not None:
+        starts = context.connection.info.get("inspector_start_time")
+        if starts:
+            starts.pop()
+
+
+def inspect_engine(engine) -> None:
+    """Feed every statement run through a sync ``Engine`` to the inspector."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+
+class QueryInspectorMiddleware:
+    """ASGI middleware reporting likely N+1 patterns at the end of each request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        queries = RequestQueries(scope)
+        token = _current_queries.set(queries)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            _current_queries.reset(token)
+            for key, count, seconds in queries.repeated(settings.N_PLUS_ONE_THRESHOLD):
+                logger.warning(
+                    "Possible N+1 on %s: %d executions (%.1f ms total) of %s",
+                    queries.route, count, seconds * 1000, key
+                )
+
+
+def _default_engines() -> list:
+    from blog_app.db.base import engine, async_engine
+
+    engines = [engine]
+    if async_engine is not None:
+        engines.append(async_engine.sync_engine)
+    return engines
+
+
+@contextmanager
+def assert_max_queries(max_queries: int, engines: Optional[Iterable] = None):
+    """Fail if more than ``max_queries`` statements run inside the block.
+
+    Counts statements on the app's engines from any thread, so it works
+    around ``TestClient`` calls. Yields the list of executed statements.
+    """
+    engines = list(engines) if engines is not None else _default_engines()
+    statements: List[str] = []
+    lock = threading.Lock()
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        with lock:
+            statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "after_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        for engine in engines:
+            event.remove(engine, "after_cursor_execute", record)
+
+    if len(statements) > max_queries:
+        grouped = Counter(fingerprint(statement) for statement in statements)
+        details = "\n".join(f"  {count} x {key}" for key, count in grouped.most_common())
+        raise AssertionError(f"Expected at most {max_queries} queries, got {len(statements)}:\n{details}")
@@ -1,3 +1,4 @@
 from .user import User, OTP
+from .email import EmailOutbox
 
-__all__ = ["User", "OTP"] 
\ No newline at end of file
+__all__ = ["User", "OTP", "EmailOutbox"] 
\ No newline at end of file
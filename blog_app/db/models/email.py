@@ -0,0 +1,33 @@
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from blog_app.db.base import Base
+
+
+class EmailOutbox(Base):
+    """Email waiting to be sent by the outbox worker.
+
+    Rows are written in the same transaction as the data they announce and
+    deleted once delivered; rows that keep failing get ``failed_at``.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String(50), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    payload = Column(JSONB, nullable=False)
+    attempts = Column(Integer, nullable=False, server_default=text("0"))
+    last_error = Column(Text, nullable=True)
+    available_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    failed_at = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Only pending rows are ever claimed, so only they are indexed
+        Index(
+            "ix_email_outbox_pending",
+            "available_at",
+            "id",
+            postgresql_where=text("failed_at IS NULL")
+        ),
+    )
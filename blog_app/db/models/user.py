@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Index, text
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from blog_app.db.base import Base
@@ -24,8 +24,15 @@ class OTP(Base):
     __tablename__ = "otps"
     
     id = Column(Integer, primary_key=True, index=True)
-    email = Column(String(255), nullable=False, index=True)
+    email = Column(String(255), nullable=False)
     otp_code = Column(String(6), nullable=False)
     is_used = Column(Boolean, default=False, nullable=False)
     expires_at = Column(DateTime(timezone=True), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now()) 
\ No newline at end of file
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Lookups only ever want unused codes; used rows stay out of the index
+        Index("ix_otps_email_live", "email", "otp_code", postgresql_where=text("NOT is_used")),
+        # Lets the purge job find expired rows without a full scan
+        Index("ix_otps_expires_at", "expires_at"),
+    )
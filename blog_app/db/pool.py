@@ -0,0 +1,91 @@
+import threading
+import time
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+
+class PoolMetrics:
+    """Checkout timings for one connection pool.
+
+    ``wait`` is the time spent getting a connection out of the pool,
+    including opening a new one; ``checkout`` additionally covers pre-ping
+    and checkout hooks. A high wait with fast queries means pool starvation.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.checkout_seconds_total = 0.0
+        self.checkout_seconds_max = 0.0
+
+    def observe_wait(self, seconds: float, timed_out: bool = False) -> None:
+        with self._lock:
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            if timed_out:
+                self.timeouts += 1
+
+    def observe_checkout(self, seconds: float) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.checkout_seconds_total += seconds
+            self.checkout_seconds_max = max(self.checkout_seconds_max, seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_seconds_total": self.wait_seconds_total,
+                "wait_seconds_max": self.wait_seconds_max,
+                "checkout_seconds_total": self.checkout_seconds_total,
+                "checkout_seconds_max": self.checkout_seconds_max,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records wait and checkout times in ``metrics``."""
+
+    metrics = PoolMetrics()
+
+    def connect(self):
+        start = time.perf_counter()
+        connection = super().connect()
+        self.metrics.observe_checkout(time.perf_counter() - start)
+        return connection
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.observe_wait(time.perf_counter() - start, timed_out=True)
+            raise
+        self.metrics.observe_wait(time.perf_counter() - start)
+        return record
+
+
+class InstrumentedAsyncAdaptedQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    """Async-driver variant of InstrumentedQueuePool."""
+
+    metrics = PoolMetrics()
+
+
+def pool_report(pool: Pool) -> dict:
+    """Describe a pool's occupancy and, if instrumented, its checkout timings."""
+    report = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        report.update({
+            "size": pool.size(),
+            "checked_in": pool.checkedin(),
+            "checked_out": pool.checkedout(),
+            "overflow": max(0, pool.overflow()),
+            "timeout_seconds": pool.timeout(),
+        })
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        report.update(metrics.snapshot())
+    return report
@@ -1,4 +1,13 @@
-from blog_app.db.base import get_db
+from typing import Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from blog_app.core.config import settings
+from blog_app.db import base
+
+# Session type yielded by get_db, depending on settings.DB_ASYNC
+AnySession = Union[Session, AsyncSession]
+
+get_db = base.get_async_db if settings.DB_ASYNC else base.get_db
 
 # Re-export for convenience
-__all__ = ["get_db"] 
\ No newline at end of file
+__all__ = ["get_db", "AnySession"]
@@ -1,3 +1,12 @@
 from .user import get_current_user, get_current_active_user, get_current_verified_user
+from .rate_limit import enforce_rate_limit, limit_per_ip, limit_per_user, refund_rate_limit
 
-__all__ = ["get_current_user", "get_current_active_user", "get_current_verified_user"] 
\ No newline at end of file
+__all__ = [
+    "get_current_user",
+    "get_current_active_user",
+    "get_current_verified_user",
+    "enforce_rate_limit",
+    "limit_per_ip",
+    "limit_per_user",
+    "refund_rate_limit"
+]
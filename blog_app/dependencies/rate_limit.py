@@ -0,0 +1,38 @@
+import math
+from fastapi import Depends, HTTPException, Request, status
+from blog_app.core.config import settings
+from blog_app.core.rate_limit import rate_limiter
+from blog_app.dependencies.user import get_current_verified_user
+
+
+async def enforce_rate_limit(name: str, identity: str) -> None:
+    """Raise 429 if ``identity`` has used up rate limit ``name``."""
+    if not settings.RATE_LIMIT_ENABLED:
+        return
+    retry_after = await rate_limiter.hit(name, identity)
+    if retry_after:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, please retry later",
+            headers={"Retry-After": str(math.ceil(retry_after))}
+        )
+
+
+async def refund_rate_limit(name: str, identity: str) -> None:
+    """Give back the request ``enforce_rate_limit`` charged, so only failures count."""
+    if settings.RATE_LIMIT_ENABLED:
+        await rate_limiter.refund(name, identity)
+
+
+def limit_per_ip(name: str):
+    """Dependency applying rate limit ``name`` to the client address."""
+    async def dependency(request: Request):
+        await enforce_rate_limit(name, request.client.host if request.client else "unknown")
+    return dependency
+
+
+def limit_per_user(name: str):
+    """Dependency applying rate limit ``name`` to the current verified user."""
+    async def dependency(current_verified_user = Depends(get_current_verified_user)):
+        await enforce_rate_limit(name, str(current_verified_user.id))
+    return dependency
@@ -1,15 +1,16 @@
 from typing import Optional
 from fastapi import Depends, HTTPException, status, Cookie
-from sqlalchemy.orm import Session
 from blog_app.core.security import verify_token
 from blog_app.core.config import settings
-from blog_app.crud.user import user_crud
-from blog_app.db.session import get_db
+from blog_app.core.revocation import revocation_list
+from blog_app.crud.async_crud import async_user_crud
+from blog_app.db.session import get_db, AnySession
+from blog_app.schemas.user import CurrentUser
 
 
-def get_current_user(
+async def get_current_user(
     access_token: Optional[str] = Cookie(None, alias=settings.ACCESS_TOKEN_COOKIE_NAME),
-    db: Session = Depends(get_db)
+    db: AnySession = Depends(get_db)
 ):
     """Get current user from JWT token in cookie."""
     if access_token is None:
@@ -28,7 +29,21 @@ def get_current_user(
     
     user_id = payload.user_id
     
-    user = user_crud.get_user_by_id(db, user_id=user_id)
+    # Stateless mode: trust the token's claims unless the user was revoked
+    if settings.AUTH_STATELESS and payload.verified is not None and payload.is_active is not None:
+        if revocation_list.is_revoked(user_id, payload.iat):
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Could not validate credentials",
+            )
+        return CurrentUser(
+            id=user_id,
+            username=payload.sub,
+            verified=payload.verified,
+            is_active=payload.is_active
+        )
+    
+    user = await async_user_crud.get_user_by_id(db, user_id=user_id)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,7 +53,7 @@ def get_current_user(
     return user
 
 
-def get_current_active_user(current_user = Depends(get_current_user)):
+async def get_current_active_user(current_user = Depends(get_current_user)):
     """Get current active user."""
     if not current_user.is_active:
         raise HTTPException(
@@ -48,7 +63,7 @@ def get_current_active_user(current_user = Depends(get_current_user)):
     return current_user
 
 
-def get_current_verified_user(current_user = Depends(get_current_user)):
+async def get_current_verified_user(current_user = Depends(get_current_active_user)):
     """Get current verified user."""
     if not current_user.verified:
         raise HTTPException(
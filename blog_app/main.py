@@ -1,15 +1,45 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 from blog_app.api.user import router as user_router
 from blog_app.api.blog import router as blog_router
+from blog_app.core.cache import invalidation_bus
 from blog_app.core.config import settings
+from blog_app.core.hashing import password_hasher, PasswordHasherBusy
+from blog_app.core.mailer import email_dispatcher
+from blog_app.core.metrics import MetricsMiddleware, instrument_engine, instrument_pool, registry
+from blog_app.core.serialization import default_response_class
+from blog_app.db.base import engine, async_engine
+from blog_app.db.inspector import QueryInspectorMiddleware, inspect_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start and stop process-wide resources."""
+    invalidation_bus.start()
+    if settings.EMAIL_DELIVERY == "queue":
+        email_dispatcher.start()
+    yield
+    invalidation_bus.close()
+    # Waits for queued mail to go out; keep the loop free for in-flight requests
+    await run_in_threadpool(email_dispatcher.shutdown, timeout=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS)
+    password_hasher.shutdown()
+    if async_engine is not None:
+        await async_engine.dispose()
+    engine.dispose()
+
 
 # Create FastAPI app
 app = FastAPI(
     title=settings.APP_NAME,
     version="1.0.0",
     description="A FastAPI backend application with modular architecture",
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    default_response_class=default_response_class(),
+    lifespan=lifespan
 )
 
 # Add CORS middleware
@@ -21,6 +51,40 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress large responses; GET /api/blog/{slug} serves its own precompressed bodies
+if settings.RESPONSE_COMPRESSION_ENABLED:
+    app.add_middleware(
+        GZipMiddleware,
+        minimum_size=settings.RESPONSE_COMPRESSION_MIN_BYTES,
+        compresslevel=settings.RESPONSE_COMPRESSION_LEVEL
+    )
+
+# Record per-route latency, status and database work
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    instrument_engine(engine)
+    instrument_pool("sync", engine.pool)
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine)
+        instrument_pool("async", async_engine.pool)
+
+# Flag slow and repeated statements per request
+if settings.QUERY_INSPECTOR_ENABLED:
+    app.add_middleware(QueryInspectorMiddleware)
+    inspect_engine(engine)
+    if async_engine is not None:
+        inspect_engine(async_engine.sync_engine)
+
+# Shed load quickly instead of queueing behind bcrypt
+@app.exception_handler(PasswordHasherBusy)
+async def password_hasher_busy_handler(request: Request, exc: PasswordHasherBusy):
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Server is busy, please retry shortly"},
+        headers={"Retry-After": "1"}
+    )
+
+
 # Include routers
 app.include_router(user_router, prefix="/api/auth", tags=["Authentication"])
 app.include_router(blog_router, prefix="/api/blog", tags=["Blog"])
@@ -40,3 +104,10 @@ async def root():
 async def health_check():
     """Health check endpoint."""
     return {"status": "healthy"}
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", response_class=PlainTextResponse, include_in_schema=False)
+    async def metrics():
+        """Prometheus scrape endpoint."""
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
@@ -1,8 +1,8 @@
-from .user import UserCreate, UserResponse, UserLogin, OTPVerify
+from .user import UserCreate, UserResponse, UserLogin, OTPVerify, CurrentUser
 from .blog import BlogCreate, BlogUpdate, BlogResponse
 from .token import TokenResponse
 
 __all__ = [
-    "UserCreate", "UserResponse", "UserLogin", "OTPVerify", "TokenResponse",
+    "UserCreate", "UserResponse", "UserLogin", "OTPVerify", "CurrentUser", "TokenResponse",
     "BlogCreate", "BlogUpdate", "BlogResponse"
 ]
\ No newline at end of file
@@ -1,11 +1,12 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
 
 class BlogBase(BaseModel):
-    title: str
-    excerpt: Optional[str]
+    # Lengths of the blogs.title and blogs.excerpt columns
+    title: str = Field(max_length=255)
+    excerpt: Optional[str] = Field(max_length=500)
     content: str
 
 class BlogCreate(BlogBase):
@@ -30,14 +31,31 @@ class BlogWithoutBody(BaseModel):
     id: int
     slug: str
     title: str
-    excerpt: str
+    excerpt: Optional[str]
     created_at: datetime
     updated_at: datetime
     author_id: int
     author_name: str
     author_username: str
 
+class BlogExport(BlogBase):
+    id: int
+    slug: str
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+    author_id: int
+    author_username: str
+
+class BulkImportResponse(BaseModel):
+    imported: int
+    seconds: float
+    rows_per_second: float
+
 class GetAllBlogsResponse(BaseModel):
     blogs: List[BlogWithoutBody]
     total_count: int
+    next_cursor: Optional[str] = None
 
+class SearchBlogsResponse(BaseModel):
+    blogs: List[BlogWithoutBody]
+    next_cursor: Optional[str] = None
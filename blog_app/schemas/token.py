@@ -13,5 +13,8 @@ class TokenResponse(BaseModel):
 class TokenPayload(BaseModel):
     sub: str
     user_id: int
+    verified: Optional[bool] = None
+    is_active: Optional[bool] = None
     exp: Optional[int] = None
+    iat: Optional[int] = None
     type: Optional[str] = None
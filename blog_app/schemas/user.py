@@ -24,6 +24,14 @@ class UserResponse(UserBase):
         from_attributes = True
 
 
+class CurrentUser(BaseModel):
+    """Authenticated user built from access token claims."""
+    id: int
+    username: str
+    verified: bool
+    is_active: bool
+
+
 class UserLogin(BaseModel):
     email: EmailStr
     password: str
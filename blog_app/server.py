@@ -0,0 +1,102 @@
+"""Production server launcher.
+
+Run with ``python -m blog_app.server``. Unlike the development command it
+starts several workers without the reloader, turns off DEBUG (and so SQL
+echo), prefers uvloop and httptools, and splits DB_MAX_CONNECTIONS between
+the workers so the whole deployment stays under the Postgres limit.
+"""
+import importlib.util
+import logging
+import os
+import uvicorn
+from blog_app.core.config import Settings, settings
+
+logger = logging.getLogger(__name__)
+
+
+def worker_count() -> int:
+    """Number of worker processes: WEB_CONCURRENCY, else one per usable core.
+
+    Cache invalidations and token revocations only reach other workers over
+    the Redis bus, so with the local bus the default is one worker and asking
+    for more is refused.
+    """
+    local_bus = settings.CACHE_INVALIDATION_BUS == "local"
+    if settings.WEB_CONCURRENCY:
+        if settings.WEB_CONCURRENCY > 1 and local_bus:
+            raise SystemExit(
+                "WEB_CONCURRENCY > 1 requires CACHE_INVALIDATION_BUS=redis; with the local bus "
+                "workers would keep serving stale cache entries and revoked tokens"
+            )
+        return settings.WEB_CONCURRENCY
+    if local_bus:
+        logger.warning("CACHE_INVALIDATION_BUS=local; starting a single worker")
+        return 1
+    return os.process_cpu_count() or 1
+
+
+def pool_size_per_worker(workers: int) -> int:
+    """Connections each worker may hold so all workers fit DB_MAX_CONNECTIONS."""
+    return max(1, settings.DB_MAX_CONNECTIONS // workers)
+
+
+def apply_production_settings(pool_size: int) -> None:
+    """Turn off DEBUG and fix the pool size, here and in spawned workers.
+
+    Spawned workers build their own Settings from the environment. A single
+    worker runs in this process, whose settings were built at import time,
+    so they are updated in place as well.
+    """
+    overrides = {"DEBUG": False, "DB_POOL_SIZE": pool_size, "DB_MAX_OVERFLOW": 0}
+    for name, value in overrides.items():
+        os.environ[name] = str(value)
+        setattr(settings, name, value)
+
+
+def check_production_settings(workers: int, pool_size: int) -> None:
+    """Exit unless the app about to be served has DEBUG off and the worker pool size."""
+    if workers == 1:
+        from blog_app.db.base import engine
+        from blog_app.main import app
+        debug = app.debug or engine.echo
+        # PgBouncer mode uses a NullPool, which has no size
+        size = pool_size if settings.DB_PGBOUNCER else engine.pool.size()
+    else:
+        worker_settings = Settings()
+        debug, size = worker_settings.DEBUG, worker_settings.DB_POOL_SIZE
+    if debug or size != pool_size:
+        raise SystemExit(f"Production settings were not applied (debug={debug}, pool size={size})")
+
+
+def main() -> None:
+    workers = worker_count()
+    pool_size = pool_size_per_worker(workers)
+    apply_production_settings(pool_size)
+    check_production_settings(workers, pool_size)
+
+    loop = "uvloop" if importlib.util.find_spec("uvloop") else "asyncio"
+    http = "httptools" if importlib.util.find_spec("httptools") else "h11"
+    logger.info(
+        "Starting %d workers (loop=%s, http=%s, db pool=%d per worker)",
+        workers, loop, http, pool_size
+    )
+
+    uvicorn.run(
+        "blog_app.main:app",
+        host=settings.SERVER_HOST,
+        port=settings.SERVER_PORT,
+        workers=workers,
+        loop=loop,
+        http=http,
+        backlog=settings.SERVER_BACKLOG,
+        timeout_keep_alive=settings.SERVER_KEEPALIVE_SECONDS,
+        # On SIGTERM stop accepting, let in-flight requests finish, then run shutdown
+        timeout_graceful_shutdown=settings.SERVER_GRACEFUL_SHUTDOWN_SECONDS,
+        proxy_headers=True,
+        access_log=settings.SERVER_ACCESS_LOG,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -1,21 +1,130 @@
-import string, re
+import base64, binascii, string, unicodedata
+from datetime import datetime
+from typing import List, Sequence, Tuple
 
 
 BASE62_ALPHABET = string.digits + string.ascii_letters
 
+# Longest title prefix kept in a slug
+SLUG_TITLE_LENGTH = 30
+
+# Letters that NFKD does not decompose into ASCII
+_TRANSLITERATIONS = str.maketrans({
+    "ß": "ss", "æ": "ae", "Æ": "ae", "œ": "oe", "Œ": "oe", "ø": "o", "Ø": "o",
+    "đ": "d", "Đ": "d", "ł": "l", "Ł": "l", "þ": "th", "Þ": "th", "ð": "d", "Ð": "d",
+})
+
+# Byte tables for ASCII titles: letters are lowercased, digits kept,
+# whitespace and separators become "-", every other byte is deleted
+_SLUG_SEPARATORS = (string.whitespace + "-_").encode()
+_SLUG_TABLE = bytes.maketrans(
+    string.ascii_uppercase.encode() + _SLUG_SEPARATORS,
+    string.ascii_lowercase.encode() + b"-" * len(_SLUG_SEPARATORS)
+)
+_SLUG_DELETE = bytes(
+    c for c in range(256)
+    if c not in (string.ascii_letters + string.digits).encode() and c not in _SLUG_SEPARATORS
+)
+# Same, but keeping the NUL bytes that separate titles in a batch
+_SLUG_DELETE_BATCH = _SLUG_DELETE.replace(b"\x00", b"")
+
+# Two base62 digits per entry, "00" to "ZZ", so each divmod yields two digits
+_BASE62_PAIRS = [a + b for a in BASE62_ALPHABET for b in BASE62_ALPHABET]
+
+
 def to_base62(num: int) -> str:
-    if num == 0:
-        return "0"
-    base62 = []
-    while num:
-        num, rem = divmod(num, 62)
-        base62.append(BASE62_ALPHABET[rem])
-    return ''.join(reversed(base62))
-
-
-def generate_slug(title, blog_id):
-    base_title = title.lower()[:30]
-    base_title = re.sub(r"\s+", "-", base_title)
-    base_title = re.sub(r"[^a-z0-9\-]", "", base_title)
-    base62_id = to_base62(blog_id)
-    return f"{base_title}-{base62_id}"
+    if num < len(_BASE62_PAIRS):
+        return _BASE62_PAIRS[num].lstrip("0") or "0"
+    pairs = []
+    while num >= len(_BASE62_PAIRS):
+        num, rem = divmod(num, len(_BASE62_PAIRS))
+        pairs.append(_BASE62_PAIRS[rem])
+    pairs.append(_BASE62_PAIRS[num].lstrip("0"))
+    return ''.join(reversed(pairs))
+
+
+def slugify_title(title: str) -> str:
+    """Reduce a title to at most SLUG_TITLE_LENGTH characters of [a-z0-9-]."""
+    if not title.isascii():
+        # Transliterate: split accents off letters, then drop what is not ASCII
+        title = unicodedata.normalize("NFKD", title.translate(_TRANSLITERATIONS))
+    slug = title.encode("ascii", "ignore").translate(_SLUG_TABLE, _SLUG_DELETE)
+    if b"--" in slug or slug.startswith(b"-") or slug.endswith(b"-"):
+        slug = b"-".join(part for part in slug.split(b"-") if part)
+    return slug[:SLUG_TITLE_LENGTH].rstrip(b"-").decode("ascii")
+
+
+def slugify_titles(titles: Sequence[str]) -> List[str]:
+    """slugify_title for many titles, translating the ASCII ones as one buffer.
+
+    The ASCII titles are joined with NUL, which the tables keep, so encoding,
+    translating and collapsing dashes is a handful of bytes calls for the
+    whole batch; only the final cut to SLUG_TITLE_LENGTH is per title.
+    """
+    slugs: List[str] = [""] * len(titles)
+    batch = []
+    for index, title in enumerate(titles):
+        if title.isascii() and "\x00" not in title:
+            batch.append(index)
+        else:
+            slugs[index] = slugify_title(title)
+    if not batch:
+        return slugs
+
+    joined = "\x00".join(titles[index] for index in batch).encode("ascii")
+    joined = joined.translate(_SLUG_TABLE, _SLUG_DELETE_BATCH)
+    while b"--" in joined:
+        joined = joined.replace(b"--", b"-")
+    joined = joined.replace(b"-\x00", b"\x00").replace(b"\x00-", b"\x00").strip(b"-")
+    for index, slug in zip(batch, joined.split(b"\x00")):
+        slugs[index] = slug[:SLUG_TITLE_LENGTH].rstrip(b"-").decode("ascii")
+    return slugs
+
+
+def generate_slug(title: str, blog_id: int) -> str:
+    """Build a blog's slug from its title and id.
+
+    The base62 id after the last "-" never contains "-", so slugs of
+    different ids cannot collide whatever their titles; no retries needed.
+    """
+    return f"{slugify_title(title) or 'post'}-{to_base62(blog_id)}"
+
+
+def generate_slugs(titles: Sequence[str], blog_ids: Sequence[int]) -> List[str]:
+    """Slugs for many blogs at once; the same as generate_slug on each pair."""
+    return [
+        f"{base or 'post'}-{to_base62(blog_id)}"
+        for base, blog_id in zip(slugify_titles(titles), blog_ids)
+    ]
+
+
+def encode_cursor(created_at: datetime, blog_id: int) -> str:
+    """Encode a (created_at, id) position as an opaque pagination cursor."""
+    raw = f"{created_at.isoformat()}|{blog_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Decode a pagination cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, blog_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(created_at), int(blog_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
+
+
+def encode_rank_cursor(rank: float, blog_id: int) -> str:
+    """Encode a (rank, id) search position as an opaque pagination cursor."""
+    raw = f"{rank!r}|{blog_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    """Decode a search pagination cursor. Raises ValueError if it is malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        rank, blog_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return float(rank), int(blog_id)
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Invalid cursor") from exc
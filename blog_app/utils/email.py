@@ -1,44 +1,44 @@
-import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from blog_app.core.config import settings
+from blog_app.core.mailer import email_dispatcher
+
+
+def build_verification_email(email: str, otp_code: str) -> MIMEMultipart:
+    """Build the verification email carrying an OTP code."""
+    # Create message
+    msg = MIMEMultipart()
+    msg['From'] = settings.EMAIL_USER
+    msg['To'] = email
+    msg['Subject'] = "Email Verification"
+    
+    # Email body
+    body = f"""
+    <html>
+    <body>
+        <h2>Email Verification</h2>
+        <p>Your verification code is: <strong>{otp_code}</strong></p>
+        <p>This code will expire in 10 minutes.</p>
+        <p>If you didn't request this verification, please ignore this email.</p>
+    </body>
+    </html>
+    """
+    
+    msg.attach(MIMEText(body, 'html'))
+    return msg
+
+
+# Outbox kinds and how to turn a row's payload into a message
+EMAIL_BUILDERS = {
+    "verification": lambda recipient, payload: build_verification_email(recipient, payload["otp_code"]),
+}
+
+
+def build_email(kind: str, recipient: str, payload: dict) -> MIMEMultipart:
+    """Build the message for an outbox row."""
+    return EMAIL_BUILDERS[kind](recipient, payload)
 
 
 def send_verification_email(email: str, otp_code: str) -> bool:
-    """Send verification email with OTP code."""
-    try:
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = settings.EMAIL_USER
-        msg['To'] = email
-        msg['Subject'] = "Email Verification"
-        
-        # Email body
-        body = f"""
-        <html>
-        <body>
-            <h2>Email Verification</h2>
-            <p>Your verification code is: <strong>{otp_code}</strong></p>
-            <p>This code will expire in 10 minutes.</p>
-            <p>If you didn't request this verification, please ignore this email.</p>
-        </body>
-        </html>
-        """
-        
-        msg.attach(MIMEText(body, 'html'))
-        
-        # Create SMTP session
-        server = smtplib.SMTP('smtp.gmail.com', 587)
-        server.starttls()
-        server.login(settings.EMAIL_USER, settings.EMAIL_PASSWORD)
-        
-        # Send email
-        text = msg.as_string()
-        server.sendmail(settings.EMAIL_USER, email, text)
-        server.quit()
-        
-        return True
-        
-    except Exception as e:
-        print(f"Error sending email: {e}")
-        return False 
\ No newline at end of file
+    """Queue verification email with OTP code."""
+    return email_dispatcher.submit(build_verification_email(email, otp_code))
@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import AsyncIterable, AsyncIterator, Optional
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A serialized response body with its validators."""
+    body: bytes
+    etag: str
+    last_modified: datetime
+    # Precompressed body, when ``body`` was large enough to be worth it
+    gzip_body: Optional[bytes] = None
+
+    @property
+    def gzip_etag(self) -> str:
+        """Strong ETag of the gzip representation, distinct from the identity one."""
+        return self.etag[:-1] + '-gzip"'
+
+
+def make_cached_response(
+    body: bytes,
+    last_modified: datetime,
+    gzip_min_size: Optional[int] = None,
+    gzip_level: int = 6
+) -> CachedResponse:
+    """Build a cache entry with a strong ETag over ``body``.
+
+    Bodies of at least ``gzip_min_size`` bytes are also gzipped once here,
+    so cache hits can be served compressed without recompressing.
+    """
+    etag = '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+    gzip_body = None
+    if gzip_min_size is not None and len(body) >= gzip_min_size:
+        # mtime=0 keeps the output, and so the gzip ETag, stable
+        gzip_body = gzip.compress(body, compresslevel=gzip_level, mtime=0)
+    return CachedResponse(body=body, etag=etag, last_modified=last_modified, gzip_body=gzip_body)
+
+
+def accepts_gzip(accept_encoding: Optional[str]) -> bool:
+    """Whether an Accept-Encoding header allows gzip, as GZipMiddleware decides it."""
+    return accept_encoding is not None and "gzip" in accept_encoding
+
+
+def cache_headers(entry: CachedResponse, max_age_cap: int, gzipped: bool = False) -> dict:
+    """Return ETag, Last-Modified and Cache-Control headers for an entry.
+
+    Freshness follows the usual heuristic of a tenth of the time since the
+    last modification, capped at ``max_age_cap`` seconds. ``gzipped``
+    selects the headers of the precompressed representation.
+    """
+    age = (datetime.now(timezone.utc) - entry.last_modified).total_seconds()
+    max_age = max(0, min(max_age_cap, int(age / 10)))
+    headers = {
+        "ETag": entry.gzip_etag if gzipped else entry.etag,
+        "Last-Modified": format_datetime(entry.last_modified.astimezone(timezone.utc), usegmt=True),
+        "Cache-Control": f"public, max-age={max_age}",
+    }
+    if gzipped:
+        # GZipMiddleware adds Vary to the identity body, but skips encoded ones
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return headers
+
+
+def is_not_modified(entry: CachedResponse, if_none_match: Optional[str], if_modified_since: Optional[str]) -> bool:
+    """Evaluate conditional request headers against an entry."""
+    if if_none_match is not None:
+        if if_none_match.strip() == "*":
+            return True
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return entry.etag in candidates or (entry.gzip_body is not None and entry.gzip_etag in candidates)
+
+    if if_modified_since is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        # HTTP dates have one-second resolution
+        return entry.last_modified.replace(microsecond=0) <= since
+
+    return False
+
+
+async def iter_lines(chunks: AsyncIterable[bytes], max_line_bytes: int) -> AsyncIterator[bytes]:
+    """Split a byte stream into lines without buffering more than one line.
+
+    Raises ValueError if a line grows beyond ``max_line_bytes``.
+    """
+    pending = []
+    pending_size = 0
+    async for chunk in chunks:
+        start = 0
+        while (end := chunk.find(b"\n", start)) != -1:
+            pending.append(chunk[start:end])
+            yield b"".join(pending)
+            pending = []
+            pending_size = 0
+            start = end + 1
+        if start < len(chunk):
+            pending.append(chunk[start:])
+            pending_size += len(chunk) - start
+            if pending_size > max_line_bytes:
+                raise ValueError(f"Line longer than {max_line_bytes} bytes")
+    if pending:
+        yield b"".join(pending)
@@ -0,0 +1,34 @@
+"""Deleted blog archive worker.
+
+Run with ``python -m blog_app.workers.blog_archive``. Each iteration moves
+up to BLOG_ARCHIVE_BATCH_SIZE blogs soft-deleted more than
+BLOG_ARCHIVE_AFTER_DAYS ago from ``blogs`` to ``blogs_archive`` in one
+statement, repeating until none are due and then sleeping for
+BLOG_ARCHIVE_INTERVAL_SECONDS. The hot table and its indexes then hold
+live posts plus only the recently deleted ones.
+"""
+import logging
+from blog_app.core.config import settings
+from blog_app.crud.blog import blog_crud
+from blog_app.db.base import SessionLocal
+from blog_app.workers.loop import run_worker
+
+logger = logging.getLogger(__name__)
+
+
+def archive_batch() -> int:
+    """Archive one batch of deleted blogs. Returns the number moved."""
+    with SessionLocal() as db:
+        moved = blog_crud.archive_deleted_blogs(db, settings.BLOG_ARCHIVE_AFTER_DAYS, settings.BLOG_ARCHIVE_BATCH_SIZE)
+    if moved:
+        logger.info("Archived %d deleted blogs", moved)
+    return moved
+
+
+def main() -> None:
+    run_worker("Blog archive", archive_batch, settings.BLOG_ARCHIVE_BATCH_SIZE, settings.BLOG_ARCHIVE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
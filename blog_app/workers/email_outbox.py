@@ -0,0 +1,68 @@
+"""Email outbox worker.
+
+Run with ``python -m blog_app.workers.email_outbox``. Each iteration claims
+up to EMAIL_OUTBOX_BATCH_SIZE due rows with ``FOR UPDATE SKIP LOCKED``,
+sends them over one transport and commits the outcome, so any number of
+workers can run side by side without claiming the same row. Delivery is
+at least once: a crash between sending and committing resends the batch.
+Failed sends are retried with exponential backoff up to EMAIL_MAX_RETRIES
+times.
+"""
+import functools
+import logging
+import time
+from blog_app.core.config import settings
+from blog_app.core.mailer import EmailTransport, create_transport, is_permanent_failure
+from blog_app.core.metrics import email_delivery_latency, email_send_duration, serve_metrics
+from blog_app.crud.email_outbox import email_outbox_crud
+from blog_app.db.base import SessionLocal
+from blog_app.utils.email import build_email
+from blog_app.workers.loop import run_worker
+
+logger = logging.getLogger(__name__)
+
+
+def process_batch(transport: EmailTransport) -> int:
+    """Send one batch of due emails. Returns the number of rows claimed."""
+    with SessionLocal() as db:
+        rows = email_outbox_crud.claim_batch(db, settings.EMAIL_OUTBOX_BATCH_SIZE)
+        for row in rows:
+            start = time.perf_counter()
+            try:
+                transport.send(build_email(row.kind, row.recipient, row.payload))
+            except Exception as exc:
+                email_send_duration.observe(time.perf_counter() - start, "failed")
+                if is_permanent_failure(exc) or row.attempts + 1 > settings.EMAIL_MAX_RETRIES:
+                    logger.error("Giving up on outbox email %d to %s: %s", row.id, row.recipient, exc)
+                    email_delivery_latency.observe(time.time() - row.created_at.timestamp(), "failed")
+                    email_outbox_crud.mark_failed(db, row, str(exc))
+                else:
+                    retry_in = settings.EMAIL_RETRY_BACKOFF_SECONDS * 2 ** row.attempts
+                    email_outbox_crud.mark_failed(db, row, str(exc), retry_in_seconds=retry_in)
+                continue
+            email_send_duration.observe(time.perf_counter() - start, "sent")
+            email_delivery_latency.observe(time.time() - row.created_at.timestamp(), "sent")
+            email_outbox_crud.mark_sent(db, row)
+        db.commit()
+        return len(rows)
+
+
+def main() -> None:
+    if settings.EMAIL_OUTBOX_METRICS_PORT:
+        serve_metrics(settings.EMAIL_OUTBOX_METRICS_PORT)
+    logger.info("Using the %s transport", settings.EMAIL_TRANSPORT)
+    transport = create_transport()
+    try:
+        run_worker(
+            "Email outbox",
+            functools.partial(process_batch, transport),
+            settings.EMAIL_OUTBOX_BATCH_SIZE,
+            settings.EMAIL_OUTBOX_POLL_SECONDS
+        )
+    finally:
+        transport.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
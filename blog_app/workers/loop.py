@@ -0,0 +1,40 @@
+"""Batch loop shared by the background workers."""
+import logging
+import signal
+import threading
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+def run_batches(
+    name: str,
+    process_batch: Callable[[], int],
+    batch_size: int,
+    interval_seconds: float,
+    stop: threading.Event
+) -> None:
+    """Call ``process_batch`` until ``stop`` is set.
+
+    ``process_batch`` returns how many rows it handled. A full batch means
+    more are probably waiting, so the next starts at once; otherwise the
+    loop sleeps for ``interval_seconds``. A failing batch is logged and
+    treated as empty.
+    """
+    while not stop.is_set():
+        try:
+            handled = process_batch()
+        except Exception:
+            logger.exception("%s batch failed", name)
+            handled = 0
+        if handled < batch_size:
+            stop.wait(interval_seconds)
+
+
+def run_worker(name: str, process_batch: Callable[[], int], batch_size: int, interval_seconds: float) -> None:
+    """Run ``process_batch`` in a loop until SIGTERM or SIGINT, finishing the current batch."""
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    logger.info("%s worker started", name)
+    run_batches(name, process_batch, batch_size, interval_seconds, stop)
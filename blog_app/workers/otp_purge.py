@@ -0,0 +1,33 @@
+"""Expired OTP purge worker.
+
+Run with ``python -m blog_app.workers.otp_purge``. Each iteration deletes
+up to OTP_PURGE_BATCH_SIZE expired OTPs in its own short transaction,
+repeating until none are left and then sleeping for
+OTP_PURGE_INTERVAL_SECONDS. Running several copies is harmless; they skip
+each other's rows.
+"""
+import logging
+from blog_app.core.config import settings
+from blog_app.crud.user import user_crud
+from blog_app.db.base import SessionLocal
+from blog_app.workers.loop import run_worker
+
+logger = logging.getLogger(__name__)
+
+
+def purge_batch() -> int:
+    """Delete one batch of expired OTPs. Returns the number deleted."""
+    with SessionLocal() as db:
+        deleted = user_crud.purge_expired_otps(db, settings.OTP_PURGE_BATCH_SIZE)
+    if deleted:
+        logger.info("Purged %d expired OTPs", deleted)
+    return deleted
+
+
+def main() -> None:
+    run_worker("OTP purge", purge_batch, settings.OTP_PURGE_BATCH_SIZE, settings.OTP_PURGE_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,58 @@
+"""Shared fixtures. The tests run against the database in DATABASE_URL.
+
+Point it at a scratch database migrated with ``alembic upgrade head``; each
+test creates its own users and posts and leaves them behind.
+"""
+import os
+import uuid
+
+# Settings are read when blog_app is first imported
+os.environ.setdefault("EMAIL_TRANSPORT", "memory")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "False")
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+os.environ.setdefault("DEBUG", "False")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import text
+from blog_app.db.base import engine
+from blog_app.main import app
+
+
+@pytest.fixture
+def client():
+    with TestClient(app) as client:
+        yield client
+
+
+def otp_code(email: str) -> str:
+    """Return the unused verification code sent to ``email``."""
+    with engine.connect() as conn:
+        return conn.execute(
+            text("SELECT otp_code FROM otps WHERE email = :email AND NOT is_used"), {"email": email}
+        ).scalar_one()
+
+
+def new_user_data() -> dict:
+    name = uuid.uuid4().hex[:12]
+    return {"email": f"{name}@example.com", "username": name, "full_name": "Test User", "password": "password"}
+
+
+@pytest.fixture
+def user(client) -> dict:
+    """A verified user, logged in on ``client``."""
+    data = new_user_data()
+    assert client.post("/api/auth/signup", json=data).status_code == 201
+    assert client.post("/api/auth/verify", json={"email": data["email"], "otp_code": otp_code(data["email"])}).status_code == 200
+    return data
+
+
+@pytest.fixture
+def blog(client, user) -> dict:
+    """A post by ``user``, as ``{"id", "slug"}``."""
+    response = client.post("/api/blog/", json={"title": f"Post {uuid.uuid4().hex}", "excerpt": "Excerpt", "content": "Body"})
+    assert response.status_code == 201
+    blog_id = response.json()["blog_id"]
+    with engine.connect() as conn:
+        slug = conn.execute(text("SELECT slug FROM blogs WHERE id = :id"), {"id": blog_id}).scalar_one()
+    return {"id": blog_id, "slug": slug}
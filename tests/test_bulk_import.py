@@ -0,0 +1,40 @@
+import json
+from blog_app.core.config import settings
+
+
+def ndjson(*rows: dict) -> bytes:
+    return b"".join(json.dumps(row).encode() + b"\n" for row in rows)
+
+
+def post(title: str = "Imported", excerpt="Excerpt", content: str = "Body") -> dict:
+    return {"title": title, "excerpt": excerpt, "content": content}
+
+
+def test_import(client, user):
+    response = client.post("/api/blog/bulk", content=ndjson(post(), post()))
+    assert response.status_code == 200
+    assert response.json()["imported"] == 2
+
+
+def test_title_too_long(client, user):
+    response = client.post("/api/blog/bulk", content=ndjson(post(), post(title="x" * 256)))
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Line 2: ")
+
+
+def test_database_error_reports_imported_count(client, user, monkeypatch):
+    monkeypatch.setattr(settings, "BLOG_BULK_BATCH_SIZE", 2)
+    # Postgres text cannot hold NUL characters
+    rows = ndjson(post(), post(), post(), post(content="a\x00b"))
+    response = client.post("/api/blog/bulk", content=rows)
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("Lines 3-4: ")
+    assert response.json()["detail"].endswith("; 2 blogs imported before them")
+
+
+def test_null_excerpt_is_listed(client, user):
+    title = f"No excerpt {user['username']}"
+    assert client.post("/api/blog/bulk", content=ndjson(post(title=title, excerpt=None))).status_code == 200
+    response = client.get("/api/blog/search", params={"q": user["username"]})
+    assert response.status_code == 200
+    assert [blog["excerpt"] for blog in response.json()["blogs"]] == [None]
@@ -0,0 +1,31 @@
+import threading
+from blog_app.core.metrics import Counter, Histogram
+
+
+def test_exited_threads_fold_into_the_totals():
+    counter = Counter("test_total", "Test counter.", ("kind",))
+    histogram = Histogram("test_seconds", "Test histogram.", (), buckets=(1.0,))
+
+    def record():
+        counter.inc("a")
+        counter.inc("b", amount=2)
+        histogram.observe(0.5)
+
+    for _ in range(20):
+        threads = [threading.Thread(target=record) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    record()
+
+    # Only this thread's shard is left
+    assert len(counter._shards) == 1
+    assert len(histogram._shards) == 1
+    assert counter._samples() == ['test_total{kind="a"} 201', 'test_total{kind="b"} 402']
+    assert histogram._samples() == [
+        'test_seconds_bucket{le="1"} 201',
+        'test_seconds_bucket{le="+Inf"} 201',
+        "test_seconds_sum 100.5",
+        "test_seconds_count 201",
+    ]
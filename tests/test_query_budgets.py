@@ -0,0 +1,56 @@
+"""Statement budgets for the hot endpoints, so N+1 regressions fail here."""
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import ProgrammingError
+from blog_app.crud.blog import blog_crud
+from blog_app.db.base import engine
+from blog_app.db.inspector import assert_max_queries, inspect_engine
+from tests.conftest import new_user_data, otp_code
+
+
+def test_signup(client):
+    # User, OTP and outbox email in one statement
+    with assert_max_queries(1):
+        assert client.post("/api/auth/signup", json=new_user_data()).status_code == 201
+
+
+def test_verify(client):
+    data = new_user_data()
+    client.post("/api/auth/signup", json=data)
+    code = otp_code(data["email"])
+    # Consumes the OTP and marks the user verified in one statement
+    with assert_max_queries(1):
+        assert client.post("/api/auth/verify", json={"email": data["email"], "otp_code": code}).status_code == 200
+
+
+def test_listing_page(client, blog):
+    # One statement for the page, one for total_count
+    with assert_max_queries(2):
+        response = client.get("/api/blog/?limit=20")
+    assert response.status_code == 200
+
+
+def test_listing_cursor_page(client, blog):
+    client.post("/api/blog/", json={"title": f"{blog['slug']} follow-up", "excerpt": "Excerpt", "content": "Body"})
+    cursor = client.get("/api/blog/?limit=1").json()["next_cursor"]
+    with assert_max_queries(2):
+        response = client.get(f"/api/blog/?limit=1&cursor={cursor}")
+    assert response.status_code == 200
+
+
+def test_get_by_slug(client, blog):
+    blog_crud.response_cache.invalidate(blog["slug"])
+    with assert_max_queries(1):
+        assert client.get(f"/api/blog/{blog['slug']}").status_code == 200
+    # Served from the response cache
+    with assert_max_queries(0):
+        assert client.get(f"/api/blog/{blog['slug']}").status_code == 200
+
+
+@pytest.mark.parametrize("key", ["query_start_time", "inspector_start_time"])
+def test_failed_statement_clears_timing_state(key):
+    inspect_engine(engine)
+    with engine.connect() as conn:
+        with pytest.raises(ProgrammingError):
+            conn.execute(text("SELECT * FROM no_such_table"))
+        assert not conn.info.get(key)
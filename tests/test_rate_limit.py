@@ -0,0 +1,25 @@
+from blog_app.core.config import settings
+from blog_app.core.rate_limit import InMemoryRateLimitBackend, RateLimit
+
+
+def test_release_returns_a_request():
+    backend = InMemoryRateLimitBackend(max_keys=100)
+    limit = RateLimit.parse("2/minute")
+    assert backend.acquire("key", limit) == 0
+    assert backend.acquire("key", limit) == 0
+    assert backend.acquire("key", limit) > 0
+    backend.release("key", limit)
+    assert backend.acquire("key", limit) == 0
+
+
+def test_successful_logins_are_not_charged_per_email(client, user, monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    credentials = {"email": user["email"], "password": user["password"]}
+    wrong = {"email": user["email"], "password": "wrong"}
+    limit = int(settings.RATE_LIMIT_LOGIN_PER_EMAIL.partition("/")[0])
+
+    for _ in range(limit * 2):
+        assert client.post("/api/auth/login", json=credentials).status_code == 200
+    for _ in range(limit):
+        assert client.post("/api/auth/login", json=wrong).status_code == 401
+    assert client.post("/api/auth/login", json=wrong).status_code == 429
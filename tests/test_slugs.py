@@ -0,0 +1,19 @@
+import pytest
+from blog_app.utils.blog import generate_slug, generate_slugs, to_base62
+
+TITLES = [
+    "Hello World", "", "---", " -a- ", "A  B", "x" * 40, "--x--y--", "a - - b", "!!!",
+    "ab-" + "c" * 27 + "-d", "Crème brûlée à la française", "Łódź", "tab\tand\nnewline", "nul\x00byte",
+]
+
+
+def test_batch_slugs_match_single_slugs():
+    ids = list(range(1000, 1000 + len(TITLES)))
+    assert generate_slugs(TITLES, ids) == [generate_slug(title, blog_id) for title, blog_id in zip(TITLES, ids)]
+
+
+@pytest.mark.parametrize("num, expected", [
+    (0, "0"), (9, "9"), (61, "Z"), (62, "10"), (3843, "ZZ"), (3844, "100"), (238327, "ZZZ"), (238328, "1000"),
+])
+def test_to_base62(num, expected):
+    assert to_base62(num) == expected
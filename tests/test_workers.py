@@ -0,0 +1,24 @@
+import threading
+from blog_app.workers.loop import run_batches
+
+
+def test_full_batches_run_back_to_back_and_failures_are_skipped():
+    stop = threading.Event()
+    results = iter([10, 10, RuntimeError("boom"), 3])
+    calls = []
+
+    def process_batch() -> int:
+        calls.append(1)
+        result = next(results)
+        if isinstance(result, Exception):
+            raise result
+        if len(calls) == 4:
+            stop.set()
+        return result
+
+    waits = []
+    stop.wait = lambda timeout=None: waits.append(timeout)
+    run_batches("Test", process_batch, batch_size=10, interval_seconds=5, stop=stop)
+    assert len(calls) == 4
+    # No pause after the two full batches; one after the failure and one after the short batch
+    assert waits == [5, 5]